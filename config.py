@@ -24,9 +24,10 @@ UPLOADS_DIR = DATA_DIR / "uploads"
 OUTPUTS_DIR = PROJECT_ROOT / "outputs"
 COURSES_JSON = DATA_DIR / "courses.json"
 COURSE_CONTEXTS_DIR = DATA_DIR / "course_contexts"
+CACHE_DIR = DATA_DIR / "cache"
 
 # Ensure directories exist
-for directory in [DATA_DIR, UPLOADS_DIR, OUTPUTS_DIR, COURSE_CONTEXTS_DIR]:
+for directory in [DATA_DIR, UPLOADS_DIR, OUTPUTS_DIR, COURSE_CONTEXTS_DIR, CACHE_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
 # Initialize courses.json if it doesn't exist
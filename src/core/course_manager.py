@@ -1,6 +1,7 @@
 """
 Course and lecture management.
 """
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 from src.utils.io_utils import read_json, write_json, read_text, write_text
@@ -75,7 +76,7 @@ class CourseManager:
             if metadata:
                 courses[course_id]["metadata"].update(metadata)
         
-        write_json(self.courses_file, courses)
+        write_json(self.courses_file, courses, durable=True)
     
     def add_or_update_lecture(
         self,
@@ -128,7 +129,7 @@ class CourseManager:
             if metadata:
                 lecture["metadata"].update(metadata)
         
-        write_json(self.courses_file, courses)
+        write_json(self.courses_file, courses, durable=True)
     
     def get_previous_lectures_summary(
         self,
@@ -218,3 +219,16 @@ class CourseManager:
         
         return course.get("lectures", {}).get(lecture_id)
 
+
+@lru_cache(maxsize=1)
+def get_course_manager() -> CourseManager:
+    """
+    Get shared course manager instance.
+    
+    CourseManager keeps no course data in memory (every method reads
+    courses.json), so one instance can serve all pages and reruns.
+    
+    Returns:
+        CourseManager instance
+    """
+    return CourseManager()
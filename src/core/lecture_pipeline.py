@@ -1,22 +1,50 @@
 """
 Main lecture generation pipeline.
 """
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from src.llm.deepseek_client import DeepSeekClient
 from src.llm.model_registry import get_llm_client, get_max_tokens_for_model
 from src.openalex.openalex_client import OpenAlexClient
 from src.pdf.pdf_loader import extract_text_from_file
 from src.pdf.pdf_splitter import split_into_chunks
 from src.pdf.pdf_summarizer import summarize_pdf_chunks
-from src.core.course_manager import CourseManager
+from src.core.course_manager import get_course_manager
 from src.core.prompts_loader import load_prompt, render_prompt
 from src.utils.io_utils import read_json, write_json, write_text, read_text
 from src.utils.text_postprocessing import normalize_text, count_words, calculate_max_tokens
 from src.utils.llm_utils import auto_extend_text
+from src.utils.llm_cache import get_cached_response, set_cached_response
 import config
 import uuid
 
+# Number of uploaded files whose text is extracted in parallel
+MAX_EXTRACT_WORKERS = 8
+
+# Cache namespace for text extracted from uploads (keyed by file content)
+EXTRACT_CACHE_NAMESPACE = "extracted_text"
+
+
+def _extract_text_cached(file_bytes: bytes, filename: str) -> str:
+    """
+    Extract text from an uploaded file, reusing the result for identical uploads.
+    
+    Keyed on a hash of the whole file (plus its extension, which selects the
+    parser): hashing runs at memory speed, parsing a large PDF takes seconds.
+    """
+    digest = hashlib.blake2b(file_bytes, digest_size=16)
+    digest.update(Path(filename).suffix.lower().encode("utf-8"))
+    key = digest.hexdigest()
+    
+    text = get_cached_response(EXTRACT_CACHE_NAMESPACE, key)
+    if text is None:
+        text = extract_text_from_file(file_bytes, filename)
+        set_cached_response(EXTRACT_CACHE_NAMESPACE, key, text)
+    return text
+
 
 class LecturePipeline:
     """Main pipeline for generating lectures."""
@@ -25,7 +53,7 @@ class LecturePipeline:
         """Initialize pipeline."""
         self.deepseek = DeepSeekClient()  # Default for backward compatibility
         self.openalex = OpenAlexClient()
-        self.course_manager = CourseManager()
+        self.course_manager = get_course_manager()
         # Grok client for PDF analysis (primary engine) - use reasoning model
         try:
             self.grok = get_llm_client("grok-4-fast-reasoning")
@@ -36,34 +64,62 @@ class LecturePipeline:
         self,
         course_id: str,
         lecture_id: str,
-        uploaded_files: List[Any]
+        uploaded_files: List[Any],
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> Dict[str, Any]:
         """
         Process uploaded PDF/DOCX/TXT files.
         
+        Text is extracted from all files in parallel (re-uploads of the same
+        file reuse the cached text, and unchanged chunks reuse their cached
+        summaries); a file that fails is skipped and reported in
+        "skipped_files" (the step fails only if every file fails).
+        
         Args:
             course_id: Course identifier
             lecture_id: Lecture identifier
             uploaded_files: List of Streamlit UploadedFile objects
+            progress_callback: Called as progress_callback(done, total) after each file is extracted
         
         Returns:
-            Dictionary with summary and key_ideas
+            Dictionary with summary, key_ideas and skipped_files (names of
+            files whose text could not be extracted)
         """
         if not uploaded_files:
             return {
                 "full_summary": "",
                 "key_ideas": [],
-                "chunks": []
+                "chunks": [],
+                "skipped_files": []
             }
         
-        all_texts = []
-        
-        # Extract text from all files
-        for file in uploaded_files:
-            file_bytes = file.read()
-            text = extract_text_from_file(file_bytes, file.name)
-            all_texts.append(text)
-        
+        # Extract text from all files (in upload order)
+        texts: List[Optional[str]] = [None] * len(uploaded_files)
+        errors = []
+        skipped = []  # Indices of files that failed, in completion order
+        workers = min(MAX_EXTRACT_WORKERS, len(uploaded_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # getvalue() returns the upload's buffer without copying and,
+            # unlike read(), does not depend on the stream position
+            futures = {
+                executor.submit(_extract_text_cached, file.getvalue(), file.name): i
+                for i, file in enumerate(uploaded_files)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    texts[i] = future.result()
+                except Exception as e:
+                    print(f"\033[93m[SOURCES WARNING] Skipping {uploaded_files[i].name}: {e}\033[0m")
+                    errors.append(e)
+                    skipped.append(i)
+                if progress_callback:
+                    progress_callback(done, len(uploaded_files))
+        
+        if len(errors) == len(uploaded_files):
+            raise errors[0]
+        
+        all_texts = [text for text in texts if text is not None]
         combined_text = "\n\n---\n\n".join(all_texts)
         
         # Split into chunks
@@ -89,6 +145,8 @@ class LecturePipeline:
         output_dir.mkdir(parents=True, exist_ok=True)
         write_json(output_dir / f"{lecture_id}_sources.json", result)
         
+        # Reported to the caller only, not stored with the summary
+        result["skipped_files"] = [uploaded_files[i].name for i in sorted(skipped)]
         return result
     
     def run_bibliography_step(
@@ -274,7 +332,8 @@ class LecturePipeline:
         outline_text: str,
         uploaded_sources_keypoints: List[str],
         bibliography: Dict[str, List[Dict]],
-        model_name: str = "deepseek-chat"
+        model_name: str = "deepseek-chat",
+        on_token: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Generate draft lecture (4000 words).
@@ -285,6 +344,7 @@ class LecturePipeline:
             outline_text: Generated outline
             uploaded_sources_keypoints: Key points from uploaded sources
             bibliography: Bibliography dictionary
+            on_token: If given, the first generation pass is streamed to it fragment by fragment
         
         Returns:
             Draft lecture text
@@ -355,13 +415,14 @@ class LecturePipeline:
             from src.llm.grok_client import call_grok
             # Combine system and user prompts for call_grok
             full_prompt_for_grok = f"{system_prompt}\n\n{draft_prompt}"
-            draft = call_grok(full_prompt_for_grok, model=model_name, max_tokens=max_tokens)
+            draft = call_grok(full_prompt_for_grok, model=model_name, max_tokens=max_tokens, on_token=on_token)
         else:
             draft = llm_client.chat(
                 system_prompt=system_prompt,
                 user_prompt=draft_prompt,
                 temperature=0.8,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                on_token=on_token
             )
             
             # Auto-extend if incomplete (only for non-Grok models)
@@ -428,7 +489,8 @@ class LecturePipeline:
         course_id: str,
         lecture_id: str,
         raw_lecture_text: str,
-        model_name: str = "deepseek-chat"
+        model_name: str = "deepseek-chat",
+        on_token: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Revise lecture with style improvements.
@@ -437,6 +499,7 @@ class LecturePipeline:
             course_id: Course identifier
             lecture_id: Lecture identifier
             raw_lecture_text: Draft lecture text
+            on_token: If given, the first generation pass is streamed to it fragment by fragment
         
         Returns:
             Revised lecture text
@@ -501,13 +564,14 @@ class LecturePipeline:
             from src.llm.grok_client import call_grok
             # Combine system and user prompts for call_grok
             full_prompt_for_grok = f"{system_prompt}\n\n{revision_prompt}"
-            revised = call_grok(full_prompt_for_grok, model=model_name, max_tokens=max_tokens)
+            revised = call_grok(full_prompt_for_grok, model=model_name, max_tokens=max_tokens, on_token=on_token)
         else:
             revised = llm_client.chat(
                 system_prompt=system_prompt,
                 user_prompt=revision_prompt,
                 temperature=0.7,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                on_token=on_token
             )
             
             # Auto-extend if incomplete (only for non-Grok models)
@@ -574,7 +638,8 @@ class LecturePipeline:
         self,
         course_id: str,
         lecture_id: str,
-        final_lecture_text: str
+        final_lecture_text: str,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Extract glossary from final lecture.
@@ -583,6 +648,7 @@ class LecturePipeline:
             course_id: Course identifier
             lecture_id: Lecture identifier
             final_lecture_text: Final lecture text
+            on_token: If given, the response is streamed to it fragment by fragment
         
         Returns:
             Glossary text
@@ -605,7 +671,8 @@ class LecturePipeline:
             system_prompt=system_prompt,
             user_prompt=glossary_prompt,
             temperature=0.5,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            on_token=on_token
         )
         
         # Auto-extend if incomplete
@@ -662,3 +729,17 @@ class LecturePipeline:
         
         return gamma_prompt
 
+
+@lru_cache(maxsize=1)
+def get_lecture_pipeline() -> LecturePipeline:
+    """
+    Get shared pipeline instance.
+    
+    The pipeline only holds LLM/OpenAlex clients and keeps no per-lecture
+    state, so one instance (and its HTTP connection pools) can serve all
+    pages and reruns instead of being rebuilt on every rerun.
+    
+    Returns:
+        LecturePipeline instance
+    """
+    return LecturePipeline()
@@ -4,7 +4,7 @@ Lecture storage and deletion utilities.
 import json
 import shutil
 from pathlib import Path
-from src.core.course_manager import CourseManager
+from src.core.course_manager import get_course_manager
 from src.utils.io_utils import read_json, write_json
 import config
 
@@ -39,12 +39,12 @@ def delete_lecture(course_id: str, lecture_id: str) -> None:
             file_path.unlink()
     
     # Remove lecture from courses.json
-    course_manager = CourseManager()
+    course_manager = get_course_manager()
     courses = course_manager.list_courses()
     
     if course_id in courses:
         if "lectures" in courses[course_id]:
             if lecture_id in courses[course_id]["lectures"]:
                 del courses[course_id]["lectures"][lecture_id]
-                write_json(config.COURSES_JSON, courses)
+                write_json(config.COURSES_JSON, courses, durable=True)
 
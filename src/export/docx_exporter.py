@@ -1,12 +1,35 @@
 """
 DOCX export utilities for lectures.
 """
+import docx
 from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO, Sequence
+import io
 import re
 
+# Blank template bundled with python-docx (what Document() opens by default)
+_TEMPLATE_PATH = Path(docx.__file__).parent / "templates" / "default.docx"
+
+
+@lru_cache(maxsize=1)
+def _template_bytes() -> bytes:
+    """Read the blank template from disk once per process."""
+    return _TEMPLATE_PATH.read_bytes()
+
+
+def new_document() -> Document:
+    """
+    Create a blank Word document from the in-memory template.
+    
+    Same result as Document(), without opening and reading the bundled
+    template file again for every export.
+    """
+    return Document(io.BytesIO(_template_bytes()))
+
 
 def md_to_docx_paragraph(document: Document, text: str):
     """
@@ -51,13 +74,19 @@ def md_to_docx_paragraph(document: Document, text: str):
             paragraph.add_run(part)
 
 
+def format_bibliography_entry(entry: dict) -> str:
+    """Format one bibliography entry as 'Authors (year). Title'."""
+    return f"{', '.join(entry.get('authors') or ())} ({entry.get('year', '')}). {entry.get('title', '')}"
+
+
 def export_lecture_to_docx(
     title: str,
     subtitle: str,
     keywords: list,
     lecture_text: str,
     bibliography: str | None = None,
-    file_path: str | Path = None
+    file_path: str | Path | BinaryIO = None,
+    bibliography_sections: Sequence[tuple[str, Sequence[dict]]] | None = None
 ) -> None:
     """
     Create a fully formatted Word (.docx) file from the generated lecture.
@@ -68,9 +97,13 @@ def export_lecture_to_docx(
         keywords: List of keywords
         lecture_text: Main lecture text (can contain Markdown)
         bibliography: Bibliography text (optional)
-        file_path: Path to save the DOCX file
+        file_path: Path to save the DOCX file, or a binary stream (e.g. BytesIO)
+            to write it into without touching the disk
+        bibliography_sections: Structured bibliography as (heading, entries)
+            pairs (optional); written entry by entry, takes precedence over
+            the bibliography text
     """
-    document = Document()
+    document = new_document()
     
     # --- Title ---
     title_para = document.add_heading(title, level=1)
@@ -128,18 +161,34 @@ def export_lecture_to_docx(
                         document.add_paragraph()  # spacing between lines
     
     # --- Bibliography ---
-    if bibliography:
+    if bibliography_sections:
+        # Lines come straight from the entries: no intermediate text to split
+        lines = (
+            line
+            for heading, entries in bibliography_sections
+            for line in (heading, *map(format_bibliography_entry, entries))
+        )
+    elif bibliography:
+        # Process bibliography line by line
+        lines = bibliography.split("\n")
+    else:
+        lines = None
+    
+    if lines is not None:
         document.add_page_break()
         document.add_heading("Библиография", level=2)
         
-        # Process bibliography line by line
-        for line in bibliography.split("\n"):
+        for line in lines:
             line = line.strip()
             if line:
-                p = document.add_paragraph(line)
-                p.style.font.size = Pt(10)  # Smaller font for bibliography
+                # Size the run, not p.style: that is the shared Normal style,
+                # so assigning it per line rewrote the whole document's font
+                document.add_paragraph().add_run(line).font.size = Pt(10)  # Smaller font for bibliography
     
-    # Save file
+    # Save file (python-docx writes to streams directly)
+    if hasattr(file_path, "write"):
+        document.save(file_path)
+        return
     path = Path(file_path) if file_path else Path("lecture.docx")
     path.parent.mkdir(parents=True, exist_ok=True)
     document.save(str(path))
@@ -2,11 +2,26 @@
 DeepSeek API client using OpenAI-compatible interface.
 """
 import os
+from functools import lru_cache
 from openai import OpenAI
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Tuple
 import config
 
 
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """
+    Get the shared OpenAI-compatible client for DeepSeek.
+    
+    The client owns an HTTP connection pool; reusing it across calls (and
+    threads - it is thread-safe) keeps connections to the API alive.
+    """
+    return OpenAI(
+        api_key=api_key,
+        base_url=config.DEEPSEEK_BASE_URL
+    )
+
+
 def call_deepseek(prompt: str, model: str = "deepseek-chat") -> str:
     """
     Simple function to call DeepSeek API.
@@ -27,10 +42,7 @@ def call_deepseek(prompt: str, model: str = "deepseek-chat") -> str:
     print(f"\033[96m[DeepSeek] Prompt length: {len(prompt)} chars\033[0m")
     
     try:
-        client = OpenAI(
-            api_key=api_key,
-            base_url=config.DEEPSEEK_BASE_URL
-        )
+        client = _get_openai_client(api_key)
         
         response = client.chat.completions.create(
             model=model,
@@ -54,10 +66,7 @@ class DeepSeekClient:
         if not api_key:
             raise ValueError("DEEPSEEK_API_KEY environment variable is required")
         
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=config.DEEPSEEK_BASE_URL
-        )
+        self.client = _get_openai_client(api_key)
         self.model = config.DEEPSEEK_MODEL
     
     @staticmethod
@@ -83,13 +92,56 @@ class DeepSeekClient:
             # Use higher default (6000) for lecture generation to prevent truncation
             return min(max(default_tokens, 6000), 7800)
     
+    def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Run one chat completion, streamed if on_token is given.
+        
+        Returns:
+            Tuple (response text, finish_reason)
+        """
+        if on_token is None:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            return response.choices[0].message.content or "", response.choices[0].finish_reason
+        
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        parts = []
+        finish_reason = None
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.delta and choice.delta.content:
+                parts.append(choice.delta.content)
+                on_token(choice.delta.content)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        return "".join(parts), finish_reason
+    
     def chat(
         self,
         system_prompt: str,
         user_prompt: str,
         extra_messages: Optional[List[Dict[str, str]]] = None,
         temperature: float = 0.7,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Send chat request to DeepSeek API with continuation support.
@@ -100,6 +152,7 @@ class DeepSeekClient:
             extra_messages: Optional list of additional messages (format: [{"role": "user/assistant", "content": "..."}])
             temperature: Temperature for generation
             max_tokens: Maximum tokens to generate
+            on_token: If given, the response is streamed and each text fragment passed to it as it arrives
         
         Returns:
             Full response content string (with continuation if needed)
@@ -116,15 +169,7 @@ class DeepSeekClient:
         print(f"\033[96m[DeepSeek] Total prompt length: {len(system_prompt) + len(user_prompt)} chars\033[0m")
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-            
-            response_text = response.choices[0].message.content or ""
-            finish_reason = response.choices[0].finish_reason
+            response_text, finish_reason = self._complete(messages, temperature, max_tokens, on_token)
             
             # Check if response was cut off and request continuation
             # finish_reason == "length" means response hit max_tokens limit
@@ -141,14 +186,12 @@ class DeepSeekClient:
                 continuation_max_tokens = min(3000, 7800 - max_tokens)
                 
                 try:
-                    continuation_response = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=continuation_messages,
-                        temperature=temperature,
-                        max_tokens=continuation_max_tokens
+                    continuation_text, _ = self._complete(
+                        continuation_messages,
+                        temperature,
+                        continuation_max_tokens,
+                        on_token
                     )
-                    
-                    continuation_text = continuation_response.choices[0].message.content or ""
                     full_text = response_text + continuation_text
                     
                     return full_text
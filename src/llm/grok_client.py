@@ -3,10 +3,13 @@ Grok API client for xAI Grok ChatCompletion API.
 Supports extremely large context windows (2M tokens) and is used for 
 PDF/document analysis and long text generation.
 """
+import json
 import os
 import requests
-import httpx
-from typing import Optional, List, Dict
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from typing import Callable, Optional, List, Dict, Tuple
 
 
 GROK_API_KEY = os.getenv("GROK_API_KEY")
@@ -24,7 +27,85 @@ except ImportError:
     ]
 
 
-def call_grok(prompt: str, model: str = None, max_tokens: int = 4096) -> str:
+# Keep-alive connections kept per host: enough for the chunk-summary workers
+# plus the wizard's worker threads and the script thread
+MAX_POOL_CONNECTIONS = 16
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    """
+    Get the shared HTTP session for Grok requests.
+    
+    One keep-alive connection pool for all calls and threads, so each request
+    after the first skips the TCP + TLS handshake to api.x.ai. Only the
+    stateless part is shared: cookies are refused (the jar is never written)
+    and headers/auth are passed per request, while urllib3's pool is
+    thread-safe and sized for every concurrent caller.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_POOL_CONNECTIONS)
+    session.mount("https://", adapter)
+    return session
+
+
+def _post_completion(
+    headers: Dict[str, str],
+    payload: Dict,
+    on_token: Optional[Callable[[str], None]] = None
+) -> Tuple[bool, str, str]:
+    """
+    POST one chat completion request, streamed (server-sent events) if on_token is given.
+    
+    Returns:
+        Tuple (ok, response text or error body, finish_reason)
+    """
+    if on_token is None:
+        response = _get_session().post(GROK_BASE_URL, headers=headers, json=payload, timeout=300)
+        if response.status_code != 200:
+            return False, response.text, "error"
+        choice = response.json()["choices"][0]
+        return True, choice["message"]["content"], choice.get("finish_reason", "stop")
+    
+    with _get_session().post(
+        GROK_BASE_URL,
+        headers=headers,
+        json={**payload, "stream": True},
+        timeout=300,
+        stream=True
+    ) as response:
+        if response.status_code != 200:
+            return False, response.text, "error"
+        
+        parts = []
+        finish_reason = "stop"
+        # Raw lines, decoded here: SSE is UTF-8 by spec, but requests would
+        # fall back to ISO-8859-1 (or yield bytes) without a charset
+        for raw_line in response.iter_lines():
+            line = raw_line.decode("utf-8")
+            if not line.startswith("data: "):
+                continue
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or []
+            if not choices:
+                continue
+            content = (choices[0].get("delta") or {}).get("content")
+            if content:
+                parts.append(content)
+                on_token(content)
+            finish_reason = choices[0].get("finish_reason") or finish_reason
+        return True, "".join(parts), finish_reason
+
+
+def call_grok(
+    prompt: str,
+    model: str = None,
+    max_tokens: int = 4096,
+    on_token: Optional[Callable[[str], None]] = None
+) -> str:
     """
     Simple function to call Grok API with auto-continue support.
     
@@ -32,6 +113,7 @@ def call_grok(prompt: str, model: str = None, max_tokens: int = 4096) -> str:
         prompt: User prompt
         model: Model name (default: grok-4-fast-reasoning)
         max_tokens: Maximum tokens to generate
+        on_token: If given, the response is streamed and each text fragment passed to it as it arrives
     
     Returns:
         Response text (complete, with auto-continue if needed)
@@ -70,10 +152,10 @@ def call_grok(prompt: str, model: str = None, max_tokens: int = 4096) -> str:
     }
     
     try:
-        response = requests.post(GROK_BASE_URL, headers=headers, json=payload, timeout=300)
+        ok, full_text, finish_reason = _post_completion(headers, payload, on_token)
         
-        if response.status_code != 200:
-            print("\033[91m[GROK ERROR]\033[0m", response.text)
+        if not ok:
+            print("\033[91m[GROK ERROR]\033[0m", full_text)
             # Fallback to DeepSeek
             try:
                 from .deepseek_client import call_deepseek
@@ -83,10 +165,6 @@ def call_grok(prompt: str, model: str = None, max_tokens: int = 4096) -> str:
                 print(f"\033[91m[FALLBACK ERROR]\033[0m {fallback_error}")
                 return "Grok API error"
         
-        data = response.json()
-        full_text = data["choices"][0]["message"]["content"]
-        finish_reason = data["choices"][0].get("finish_reason", "stop")
-        
         # Auto-continue if generation was cut off due to token limit
         iteration = 1
         while finish_reason == "length":
@@ -109,16 +187,15 @@ def call_grok(prompt: str, model: str = None, max_tokens: int = 4096) -> str:
                 "temperature": 0.7
             }
             
-            continue_response = requests.post(GROK_BASE_URL, headers=headers, json=continue_payload, timeout=300)
+            if on_token:
+                on_token(" ")
+            ok, continuation, finish_reason = _post_completion(headers, continue_payload, on_token)
             
-            if continue_response.status_code != 200:
+            if not ok:
                 print(f"\033[91m[GROK ERROR] Continue request failed\033[0m")
                 break
             
-            continue_data = continue_response.json()
-            continuation = continue_data["choices"][0]["message"]["content"]
             full_text += " " + continuation
-            finish_reason = continue_data["choices"][0].get("finish_reason", "stop")
             
             # Safety limit to prevent infinite loops
             if iteration >= 10:
@@ -207,11 +284,11 @@ class GrokClient:
         print(f"\033[96m[GROK] Total prompt length: {len(system_prompt) + len(user_prompt)} chars\033[0m")
         
         try:
-            with httpx.Client(timeout=300) as client:  # 5 minute timeout for large documents
-                response = client.post(self.url, headers=headers, json=payload)
-                response.raise_for_status()
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
+            # 5 minute timeout for large documents
+            response = _get_session().post(self.url, headers=headers, json=payload, timeout=300)
+            response.raise_for_status()
+            data = response.json()
+            return data["choices"][0]["message"]["content"]
         except Exception as e:
             print(f"\033[91m[GROK ERROR]\033[0m {str(e)}")
             raise Exception(f"Grok API error: {str(e)}")
@@ -7,7 +7,7 @@ from .deepseek_client import DeepSeekClient
 from .grok_client import GrokClient
 
 # Complete list of available models
-MODEL_REGISTRY = [
+MODEL_REGISTRY = (
     # xAI Grok — reasoning + fast + base
     "grok-4-fast-reasoning",
     "grok-4-reasoning",
@@ -18,7 +18,12 @@ MODEL_REGISTRY = [
     "deepseek-reasoner",
     # OpenAI fallback (если не используется)
     "gpt-4o-mini",
-]
+)
+
+# Default model for selectboxes (grok-4-fast-reasoning if available),
+# resolved once at import instead of scanning the registry on every rerun
+DEFAULT_MODEL = "grok-4-fast-reasoning"
+DEFAULT_MODEL_INDEX = MODEL_REGISTRY.index(DEFAULT_MODEL) if DEFAULT_MODEL in MODEL_REGISTRY else 0
 
 
 def get_llm_client(model_name: Optional[str] = None) -> Any:
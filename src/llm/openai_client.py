@@ -2,10 +2,17 @@
 OpenAI API client for GPT models.
 """
 import os
+from functools import lru_cache
 from openai import OpenAI
 import config
 
 
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """Get the shared OpenAI client (reuses its HTTP connection pool)."""
+    return OpenAI(api_key=api_key)
+
+
 def call_openai(prompt: str, model: str = "gpt-4o-mini") -> str:
     """
     Simple function to call OpenAI API.
@@ -26,7 +33,7 @@ def call_openai(prompt: str, model: str = "gpt-4o-mini") -> str:
     print(f"\033[96m[OPENAI] Prompt length: {len(prompt)} chars\033[0m")
     
     try:
-        client = OpenAI(api_key=api_key)
+        client = _get_openai_client(api_key)
         
         response = client.chat.completions.create(
             model=model,
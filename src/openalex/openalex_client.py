@@ -1,14 +1,72 @@
 """
 OpenAlex API client using pyalex library for stable and reliable searches.
 """
+import pyalex
 from pyalex import Works
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
+from src.utils.io_utils import read_json, write_json
+from src.utils.llm_cache import llm_cache_key
+from src.utils.text_postprocessing import split_comma_list
 import config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Send the contact email with every request so calls are routed to the
+# OpenAlex "polite pool" (faster and more consistent response times)
+pyalex.config.email = config.OPENALEX_EMAIL or None
+
+# Retry rate-limited (429) and transient server errors; urllib3 honors the
+# Retry-After header, so concurrent searches back off instead of failing
+pyalex.config.max_retries = 3
+pyalex.config.retry_backoff_factor = 0.5
+
+# Keyword searches in flight at once (well under the polite pool's 10 req/s)
+MAX_SEARCH_WORKERS = 5
+
+# Maximum number of authors stored per bibliography entry
+MAX_BIBLIOGRAPHY_AUTHORS = 5
+
+# On-disk cache of raw search results per keyword (citation counts drift,
+# so entries expire after an hour)
+SEARCH_CACHE_NAMESPACE = "openalex_search"
+SEARCH_CACHE_TTL = 3600
+
+
+def _search_keyword(kw: str) -> List[Dict]:
+    """
+    Search OpenAlex for one keyword, serving repeats from the disk cache.
+    
+    Core and recent searches usually share keywords, and users re-run the
+    bibliography step after small edits, so most lookups are repeats.
+    
+    Args:
+        kw: Search keyword
+    
+    Returns:
+        List of work dictionaries (up to 50)
+    """
+    cache_file = config.CACHE_DIR / SEARCH_CACHE_NAMESPACE / f"{llm_cache_key(kw.strip())}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < SEARCH_CACHE_TTL:
+            logger.info(f"  ✓ Результаты для '{kw}' взяты из кэша")
+            return read_json(cache_file)
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache entry - fetch again
+    
+    # Works().search() returns a query object, .get() executes the query
+    query_result = Works().search(kw).get(per_page=50)
+    if isinstance(query_result, dict):
+        query_result = [query_result]
+    if query_result:
+        works = [dict(work) for work in query_result]
+        write_json(cache_file, works)
+        return works
+    return []
+
 
 def search_openalex(keywords: list[str], authors: list[str] = None, limit: int = 20) -> List[Dict]:
     """
@@ -26,36 +84,33 @@ def search_openalex(keywords: list[str], authors: list[str] = None, limit: int =
     
     # Normalize keywords - split by comma if string, or use list directly
     if isinstance(keywords, str):
-        keywords = [kw.strip() for kw in keywords.split(",") if kw.strip()]
+        keywords = split_comma_list(keywords)
     
-    for kw in keywords:
-        if not kw or not kw.strip():
-            continue
-        
+    keywords = [kw for kw in keywords if kw and kw.strip()]
+    
+    def fetch(kw: str) -> List[Dict]:
         logger.info(f"🔍 OpenAlex: ищу по ключевому слову: {kw}")
-        
         try:
             # Use pyalex Works().search() - stable and reliable
-            # Works().search() returns a query object, .get() executes the query
-            query_result = Works().search(kw).get(per_page=50)
-            
-            if query_result:
-                if isinstance(query_result, list):
-                    all_results.extend(query_result)
-                    logger.info(f"  ✓ Найдено {len(query_result)} результатов для '{kw}'")
-                elif isinstance(query_result, dict):
-                    # Single result
-                    all_results.append(query_result)
-                    logger.info(f"  ✓ Найден 1 результат для '{kw}'")
-                else:
-                    logger.warning(f"  ⚠️ Неожиданный тип результата для '{kw}': {type(query_result)}")
-            else:
-                logger.warning(f"  ⚠️ Нет результатов для '{kw}'")
+            query_result = _search_keyword(kw)
         except Exception as e:
             logger.error(f"❌ Ошибка в OpenAlex для '{kw}': {e}")
             import traceback
             logger.error(traceback.format_exc())
-            continue
+            return []
+        
+        if query_result:
+            logger.info(f"  ✓ Найдено {len(query_result)} результатов для '{kw}'")
+        else:
+            logger.warning(f"  ⚠️ Нет результатов для '{kw}'")
+        return query_result
+    
+    # Keywords are independent HTTP queries - run them concurrently;
+    # map() keeps results in keyword order, so dedup below is unchanged
+    if keywords:
+        with ThreadPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(keywords))) as executor:
+            for query_result in executor.map(fetch, keywords):
+                all_results.extend(query_result)
     
     if not all_results:
         logger.warning("⚠️ OpenAlex не вернул результатов")
@@ -92,7 +147,7 @@ def search_openalex(keywords: list[str], authors: list[str] = None, limit: int =
     # Post-filter by authors if provided
     if authors:
         if isinstance(authors, str):
-            authors = [a.strip() for a in authors.split(",") if a.strip()]
+            authors = split_comma_list(authors)
         
         filtered = []
         for work in results:
@@ -144,11 +199,14 @@ def build_bibliography(works: List[Dict]) -> List[Dict]:
         if not isinstance(work, dict):
             continue
         
-        # Extract authors
+        # Extract authors (only the first MAX_BIBLIOGRAPHY_AUTHORS are kept,
+        # so stop early on large collaborations with hundreds of authorships)
         authors = []
         authorships = work.get("authorships", [])
         if authorships:
             for authorship in authorships:
+                if len(authors) >= MAX_BIBLIOGRAPHY_AUTHORS:
+                    break
                 if not isinstance(authorship, dict):
                     continue
                 author = authorship.get("author", {})
@@ -192,7 +250,7 @@ def build_bibliography(works: List[Dict]) -> List[Dict]:
         
         entry = {
             "title": work.get("title", "Untitled"),
-            "authors": authors[:5],  # Limit to first 5 authors
+            "authors": authors,  # Already limited to first MAX_BIBLIOGRAPHY_AUTHORS
             "year": year,
             "doi": doi,
             "openalex_id": openalex_id,
@@ -213,10 +271,8 @@ class OpenAlexClient:
     
     def __init__(self):
         """Initialize OpenAlex client."""
-        # Set email for pyalex (if configured)
+        # Email is set on pyalex.config at import (polite pool)
         if config.OPENALEX_EMAIL:
-            import os
-            os.environ["OPENALEX_EMAIL"] = config.OPENALEX_EMAIL
             logger.info(f"📧 OpenAlex: используется email {config.OPENALEX_EMAIL}")
     
     def search_works(
@@ -315,11 +371,11 @@ class OpenAlexClient:
         # Normalize keywords
         core_kw_list = []
         if core_keywords:
-            core_kw_list = [kw.strip() for kw in core_keywords.split(",") if kw.strip()]
+            core_kw_list = split_comma_list(core_keywords)
         
         recent_kw_list = []
         if recent_keywords:
-            recent_kw_list = [kw.strip() for kw in recent_keywords.split(",") if kw.strip()]
+            recent_kw_list = split_comma_list(recent_keywords)
         else:
             # Use core keywords if recent keywords not provided
             recent_kw_list = core_kw_list.copy()
@@ -327,7 +383,7 @@ class OpenAlexClient:
         # Normalize authors
         authors_list = None
         if core_authors:
-            authors_list = [a.strip() for a in core_authors.split(",") if a.strip()]
+            authors_list = split_comma_list(core_authors)
         
         # Search for core works
         logger.info(f"🔍 OpenAlex: поиск core работ по ключевым словам: {core_kw_list}")
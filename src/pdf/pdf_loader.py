@@ -2,11 +2,14 @@
 PDF text extraction utilities.
 """
 import io
+import re
 import pdfplumber
 import fitz  # PyMuPDF
 from typing import Optional
 from pathlib import Path
 
+_NEWLINE_RE = re.compile(r"\r\n?")
+
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
     """
@@ -18,7 +21,7 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
     Returns:
         Extracted text as string
     """
-    text = ""
+    pages = []
     
     # Try pdfplumber first (better for complex layouts)
     try:
@@ -26,21 +29,21 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
             for page in pdf.pages:
                 page_text = page.extract_text()
                 if page_text:
-                    text += page_text + "\n"
+                    pages.append(page_text)
     except Exception as e:
         # Fallback to PyMuPDF
         try:
             doc = fitz.open(stream=file_bytes, filetype="pdf")
             for page in doc:
-                text += page.get_text() + "\n"
+                pages.append(page.get_text())
             doc.close()
         except Exception as e2:
             raise Exception(f"Failed to extract text from PDF: {str(e2)}")
     
-    # Clean up text
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    # Clean up text (single join + single newline normalization pass)
+    text = _NEWLINE_RE.sub('\n', '\n'.join(pages))
     # Remove excessive whitespace
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    lines = [s for s in (line.strip() for line in text.split('\n')) if s]
     return '\n'.join(lines)
 
 
@@ -2,14 +2,47 @@
 PDF summarization using Grok (primary) or DeepSeek (fallback).
 Grok is used for large document analysis due to its 2M token context window.
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from src.llm.model_registry import get_llm_client
 from src.utils.io_utils import read_text, write_json
 from src.utils.text_postprocessing import calculate_max_tokens
 from src.utils.llm_utils import auto_extend_text
+from src.utils.llm_cache import llm_cache_key, get_cached_response, set_cached_response
 from pathlib import Path
 import config
 
+# Cache namespace for summaries (re-runs over the same PDF skip the LLM)
+SUMMARY_CACHE_NAMESPACE = "llm_summaries"
+
+# Length of the chunk preview stored in sources.json (summaries are what matter)
+CHUNK_PREVIEW_LENGTH = 200
+
+# Maximum number of chunk summaries requested from the LLM concurrently
+MAX_SUMMARY_WORKERS = 8
+
+# Prompt templates (built once at import, filled with str.replace)
+CHUNK_SYSTEM_PROMPT = "Ты — эксперт по анализу научных текстов. Делай краткие, точные резюме."
+SUMMARY_SYSTEM_PROMPT = "Ты — эксперт по анализу научных текстов."
+
+COMBINED_SUMMARY_TEMPLATE = """Объедини все резюме фрагментов в единое структурированное резюме документа.
+
+Резюме фрагментов:
+{chunks}
+
+Создай:
+1. Краткое содержание (5-10 предложений)
+2. Ключевые идеи (bullet list)
+3. Важные термины
+4. Методологические опоры
+5. Значение для лекции"""
+
+KEY_IDEAS_TEMPLATE = """Из следующего резюме извлеки только ключевые идеи в виде списка (bullet points):
+
+{summary}
+
+Верни только список ключевых идей, по одной на строку."""
+
 
 def summarize_pdf_chunks(
     chunks: List[str],
@@ -38,9 +71,21 @@ def summarize_pdf_chunks(
     # Grok can handle much larger context
     is_grok = hasattr(llm_client, 'model') and 'grok' in str(llm_client.model).lower()
     
-    # Summarize each chunk
-    for i, chunk in enumerate(chunks):
-        user_prompt = prompt_template.format(chunk_text=chunk)
+    # Resolve Grok call and model once instead of on every chunk
+    call_grok = None
+    grok_model = None  # None: call_grok uses its default model
+    if is_grok:
+        from src.llm.grok_client import call_grok
+        # Use reasoning model for PDF analysis - get default_model from client
+        grok_model = getattr(llm_client, 'default_model', None)
+    
+    # Model identifier for cache keys
+    model_name = str(grok_model if is_grok else getattr(llm_client, 'model', ''))
+    
+    def summarize_chunk(chunk: str) -> str:
+        """Summarize one chunk (cached; safe to run on a worker thread)."""
+        # str.replace avoids re-parsing the format spec for every chunk
+        user_prompt = prompt_template.replace("{chunk_text}", chunk)
         
         # Use appropriate max_tokens based on model
         if is_grok:
@@ -48,22 +93,19 @@ def summarize_pdf_chunks(
         else:
             max_tokens = calculate_max_tokens(1500)
         
+        cache_key = llm_cache_key(model_name, CHUNK_SYSTEM_PROMPT, user_prompt)
+        summary = get_cached_response(SUMMARY_CACHE_NAMESPACE, cache_key)
+        if summary is not None:
+            return summary
+        
         # Use Grok for PDF analysis if available (simplified call)
         if is_grok:
-            from src.llm.grok_client import call_grok
             # Build full prompt for Grok
-            full_prompt = f"""Ты — эксперт по анализу научных текстов. Делай краткие, точные резюме.
-
-{user_prompt}"""
-            # Use reasoning model for PDF analysis - get default_model from client
-            if hasattr(llm_client, 'default_model'):
-                grok_model = llm_client.default_model
-            else:
-                grok_model = None  # Will use default in call_grok
+            full_prompt = f"{CHUNK_SYSTEM_PROMPT}\n\n{user_prompt}"
             summary = call_grok(full_prompt, model=grok_model)
         else:
             summary = llm_client.chat(
-                system_prompt="Ты — эксперт по анализу научных текстов. Делай краткие, точные резюме.",
+                system_prompt=CHUNK_SYSTEM_PROMPT,
                 user_prompt=user_prompt,
                 temperature=0.5,
                 max_tokens=max_tokens
@@ -73,101 +115,99 @@ def summarize_pdf_chunks(
         if not is_grok:
             summary = auto_extend_text(
                 llm_client,
-                "Ты — эксперт по анализу научных текстов. Делай краткие, точные резюме.",
+                CHUNK_SYSTEM_PROMPT,
                 user_prompt,
                 summary,
                 max_tokens
             )
         
+        set_cached_response(SUMMARY_CACHE_NAMESPACE, cache_key, summary)
+        return summary
+    
+    # Chunk summaries are independent LLM calls (network-bound), so they are
+    # requested concurrently; map() keeps them in chunk order
+    summaries = []
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(MAX_SUMMARY_WORKERS, len(chunks))) as executor:
+            summaries = list(executor.map(summarize_chunk, chunks))
+    
+    for i, (chunk, summary) in enumerate(zip(chunks, summaries)):
+        if len(chunk) > CHUNK_PREVIEW_LENGTH:
+            preview = f"{chunk[:CHUNK_PREVIEW_LENGTH]}..."
+        else:
+            preview = chunk
+        
         chunk_summaries.append({
             "chunk_index": i,
-            "chunk_text": chunk[:500] + "..." if len(chunk) > 500 else chunk,  # Store preview
+            "chunk_text": preview,  # Store preview
             "summary": summary
         })
     
     # Create combined summary
-    combined_chunks_text = "\n\n---\n\n".join([cs["summary"] for cs in chunk_summaries])
+    combined_chunks_text = "\n\n---\n\n".join(cs["summary"] for cs in chunk_summaries)
     
-    combined_prompt = f"""Объедини все резюме фрагментов в единое структурированное резюме документа.
-
-Резюме фрагментов:
-{combined_chunks_text}
-
-Создай:
-1. Краткое содержание (5-10 предложений)
-2. Ключевые идеи (bullet list)
-3. Важные термины
-4. Методологические опоры
-5. Значение для лекции"""
+    combined_prompt = COMBINED_SUMMARY_TEMPLATE.replace("{chunks}", combined_chunks_text)
     
-    # Use appropriate max_tokens for combined summary
-    if is_grok:
-        from src.llm.grok_client import call_grok
-        full_prompt = f"""Ты — эксперт по анализу научных текстов.
-
-{combined_prompt}"""
-        # Use reasoning model for PDF analysis - get default_model from client
-        if hasattr(llm_client, 'default_model'):
-            grok_model = llm_client.default_model
+    cache_key = llm_cache_key(model_name, SUMMARY_SYSTEM_PROMPT, combined_prompt)
+    full_summary = get_cached_response(SUMMARY_CACHE_NAMESPACE, cache_key)
+    
+    if full_summary is None:
+        # Use appropriate max_tokens for combined summary
+        if is_grok:
+            full_prompt = f"{SUMMARY_SYSTEM_PROMPT}\n\n{combined_prompt}"
+            full_summary = call_grok(full_prompt, model=grok_model)
         else:
-            grok_model = None  # Will use default in call_grok
-        full_summary = call_grok(full_prompt, model=grok_model)
-    else:
-        max_tokens = calculate_max_tokens(2500)
-        full_summary = llm_client.chat(
-            system_prompt="Ты — эксперт по анализу научных текстов.",
-            user_prompt=combined_prompt,
-            temperature=0.5,
-            max_tokens=max_tokens
-        )
-    
-    # Auto-extend if incomplete (only for non-Grok models)
-    if not is_grok:
-        full_summary = auto_extend_text(
-            llm_client,
-            "Ты — эксперт по анализу научных текстов.",
-            combined_prompt,
-            full_summary,
-            max_tokens
-        )
+            max_tokens = calculate_max_tokens(2500)
+            full_summary = llm_client.chat(
+                system_prompt=SUMMARY_SYSTEM_PROMPT,
+                user_prompt=combined_prompt,
+                temperature=0.5,
+                max_tokens=max_tokens
+            )
+        
+        # Auto-extend if incomplete (only for non-Grok models)
+        if not is_grok:
+            full_summary = auto_extend_text(
+                llm_client,
+                SUMMARY_SYSTEM_PROMPT,
+                combined_prompt,
+                full_summary,
+                max_tokens
+            )
+        
+        set_cached_response(SUMMARY_CACHE_NAMESPACE, cache_key, full_summary)
     
     # Extract key ideas
-    key_ideas_prompt = f"""Из следующего резюме извлеки только ключевые идеи в виде списка (bullet points):
-
-{full_summary}
-
-Верни только список ключевых идей, по одной на строку."""
+    key_ideas_prompt = KEY_IDEAS_TEMPLATE.replace("{summary}", full_summary)
     
-    # Use appropriate max_tokens for key ideas
-    if is_grok:
-        from src.llm.grok_client import call_grok
-        full_prompt = f"""Ты — эксперт по анализу научных текстов.
-
-{key_ideas_prompt}"""
-        # Use reasoning model for PDF analysis - get default_model from client
-        if hasattr(llm_client, 'default_model'):
-            grok_model = llm_client.default_model
+    cache_key = llm_cache_key(model_name, SUMMARY_SYSTEM_PROMPT, key_ideas_prompt)
+    key_ideas_text = get_cached_response(SUMMARY_CACHE_NAMESPACE, cache_key)
+    
+    if key_ideas_text is None:
+        # Use appropriate max_tokens for key ideas
+        if is_grok:
+            full_prompt = f"{SUMMARY_SYSTEM_PROMPT}\n\n{key_ideas_prompt}"
+            key_ideas_text = call_grok(full_prompt, model=grok_model)
         else:
-            grok_model = None  # Will use default in call_grok
-        key_ideas_text = call_grok(full_prompt, model=grok_model)
-    else:
-        max_tokens = calculate_max_tokens(1500)
-        key_ideas_text = llm_client.chat(
-            system_prompt="Ты — эксперт по анализу научных текстов.",
-            user_prompt=key_ideas_prompt,
-            temperature=0.3,
-            max_tokens=max_tokens
-        )
-    
-    # Auto-extend if incomplete (only for non-Grok models)
-    if not is_grok:
-        key_ideas_text = auto_extend_text(
-            llm_client,
-            "Ты — эксперт по анализу научных текстов.",
-            key_ideas_prompt,
-            key_ideas_text,
-            max_tokens
-        )
+            max_tokens = calculate_max_tokens(1500)
+            key_ideas_text = llm_client.chat(
+                system_prompt=SUMMARY_SYSTEM_PROMPT,
+                user_prompt=key_ideas_prompt,
+                temperature=0.3,
+                max_tokens=max_tokens
+            )
+        
+        # Auto-extend if incomplete (only for non-Grok models)
+        if not is_grok:
+            key_ideas_text = auto_extend_text(
+                llm_client,
+                SUMMARY_SYSTEM_PROMPT,
+                key_ideas_prompt,
+                key_ideas_text,
+                max_tokens
+            )
+        
+        set_cached_response(SUMMARY_CACHE_NAMESPACE, cache_key, key_ideas_text)
     
     key_ideas = [line.strip("- •").strip() for line in key_ideas_text.split("\n") if line.strip() and line.strip().startswith(("-", "•"))]
     
@@ -1,12 +1,123 @@
 """
 Lecture storage utilities for loading and saving complete lecture data.
 """
+import copy
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional, Any
-from src.core.course_manager import CourseManager
-from src.utils.io_utils import read_json, write_json, read_text
+from typing import Dict, Iterator, Optional, Any, Tuple
+from src.core.course_manager import get_course_manager
+from src.utils.io_utils import read_json, write_json, read_text, write_text, read_text_mmap, MMAP_READ_THRESHOLD
 import config
 
+# Number of threads used to read lecture files in parallel
+MAX_LOAD_WORKERS = 8
+
+# Lecture output files: (field, file name suffix after lecture_id, loader, value if missing)
+_OUTPUT_SUFFIXES = (
+    ("draft", "_draft.md", read_text, ""),
+    ("final", "_final.md", read_text, ""),
+    ("outline", "_outline.md", read_text, ""),
+    ("glossary", "_glossary.md", read_text, ""),
+    ("bibliography_summary", "_bibliography_summary.md", read_text, ""),
+    ("bibliography", "_bibliography.json", read_json, None),
+)
+
+# Text fields written back by save_lecture_data
+_SAVED_FIELDS = frozenset(("draft", "final", "outline", "glossary"))
+
+# Saved fields written with fsync + atomic rename; the rest are edited
+# often and take the plain write path
+_DURABLE_FIELDS = frozenset(("final",))
+
+# In-process cache: (course_id, lecture_id) -> (freshness token, lecture data).
+# Streamlit reruns the editor on every widget interaction; while nothing
+# changed on disk the lecture is served from here instead of re-read.
+_lecture_cache: Dict[Tuple[str, str], Tuple[Any, Dict[str, Any]]] = {}
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _scan_files(directory: Path, prefix: str) -> Dict[str, Tuple[int, int]]:
+    """
+    List regular files starting with prefix in a single directory scan.
+    
+    Args:
+        directory: Directory to scan
+        prefix: File name prefix (e.g. "{lecture_id}_")
+    
+    Returns:
+        Dictionary of file name -> (mtime_ns, size); empty if directory does not exist
+    """
+    files = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        pass
+    return files
+
+
+def _content_hash(text: str) -> str:
+    """Return short digest of text content."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _freshness_token(
+    course_id: str,
+    lecture_id: str
+) -> Tuple[Any, Dict[str, Tuple[int, int]], Optional[Tuple[int, int]]]:
+    """
+    Compute the cache freshness token of a lecture.
+    
+    One directory scan instead of a stat() per file; the scan result
+    together with courses.json and sources.json forms the token.
+    
+    Returns:
+        Tuple (token, existing output files, sources.json signature)
+    """
+    existing_files = _scan_files(config.OUTPUTS_DIR / course_id, f"{lecture_id}_")
+    sources_signature = _file_signature(config.UPLOADS_DIR / course_id / lecture_id / "sources.json")
+    token = (
+        _file_signature(config.COURSES_JSON),
+        tuple(sorted(existing_files.items())),
+        sources_signature,
+    )
+    return token, existing_files, sources_signature
+
+
+def _write_if_changed(lecture_data: Dict[str, Any], key: str, file_path: Path) -> None:
+    """
+    Write lecture_data[key] to file_path unless it matches the content loaded from disk.
+    
+    Args:
+        lecture_data: Lecture data dictionary (with "_hashes" from load_full_lecture_data)
+        key: Text field name (draft, final, outline, glossary)
+        file_path: Output file path
+    """
+    content = lecture_data.get(key)
+    if not content:
+        return
+    
+    hashes = lecture_data.setdefault("_hashes", {})
+    new_hash = _content_hash(content)
+    if hashes.get(key) == new_hash:
+        return
+    
+    write_text(file_path, content, durable=key in _DURABLE_FIELDS)
+    hashes[key] = new_hash
+
 
 def load_full_lecture_data(course_id: str, lecture_id: str) -> Dict[str, Any]:
     """
@@ -19,7 +130,18 @@ def load_full_lecture_data(course_id: str, lecture_id: str) -> Dict[str, Any]:
     Returns:
         Dictionary with all lecture data
     """
-    course_manager = CourseManager()
+    output_dir = config.OUTPUTS_DIR / course_id
+    sources_file = config.UPLOADS_DIR / course_id / lecture_id / "sources.json"
+    
+    token, existing_files, sources_signature = _freshness_token(course_id, lecture_id)
+    
+    cache_key = (course_id, lecture_id)
+    cached = _lecture_cache.get(cache_key)
+    if cached is not None and cached[0] == token:
+        # Callers mutate the returned dict, so hand out a copy
+        return copy.deepcopy(cached[1])
+    
+    course_manager = get_course_manager()
     
     # Get metadata from courses.json
     lecture_metadata = course_manager.get_lecture(course_id, lecture_id)
@@ -37,55 +159,46 @@ def load_full_lecture_data(course_id: str, lecture_id: str) -> Dict[str, Any]:
         "target_length": lecture_metadata.get("target_length", 4000),
         "order": lecture_metadata.get("order", 0),
         "metadata": lecture_metadata.get("metadata", {}),
-        "draft": "",
-        "final": "",
-        "outline": "",
-        "glossary": "",
-        "bibliography": None,
-        "bibliography_summary": "",
         "sources_summary": "",
-        "sources_key_ideas": []
+        "sources_key_ideas": [],
+        # Digests of text files as loaded, used by save_lecture_data to skip unchanged writes
+        "_hashes": {}
     }
     
-    # Load text files from outputs directory
-    output_dir = config.OUTPUTS_DIR / course_id
+    # Load output files that exist (missing ones keep their default value)
+    files_to_load = []
+    for key, suffix, loader, default in _OUTPUT_SUFFIXES:
+        lecture_data[key] = default
+        file_name = lecture_id + suffix
+        if file_name not in existing_files:
+            continue
+        # Large markdown files are decoded straight from a memory map
+        if loader is read_text and existing_files[file_name][1] > MMAP_READ_THRESHOLD:
+            loader = read_text_mmap
+        files_to_load.append((key, output_dir / file_name, loader))
+    if sources_signature is not None:
+        files_to_load.append(("sources", sources_file, read_json))
     
-    # Load draft
-    draft_file = output_dir / f"{lecture_id}_draft.md"
-    if draft_file.exists():
-        lecture_data["draft"] = read_text(draft_file)
-    
-    # Load final
-    final_file = output_dir / f"{lecture_id}_final.md"
-    if final_file.exists():
-        lecture_data["final"] = read_text(final_file)
-    
-    # Load outline
-    outline_file = output_dir / f"{lecture_id}_outline.md"
-    if outline_file.exists():
-        lecture_data["outline"] = read_text(outline_file)
-    
-    # Load glossary
-    glossary_file = output_dir / f"{lecture_id}_glossary.md"
-    if glossary_file.exists():
-        lecture_data["glossary"] = read_text(glossary_file)
-    
-    # Load bibliography summary
-    bib_summary_file = output_dir / f"{lecture_id}_bibliography_summary.md"
-    if bib_summary_file.exists():
-        lecture_data["bibliography_summary"] = read_text(bib_summary_file)
-    
-    # Load bibliography JSON
-    bib_file = output_dir / f"{lecture_id}_bibliography.json"
-    if bib_file.exists():
-        lecture_data["bibliography"] = read_json(bib_file)
-    
-    # Load sources data
-    sources_file = config.UPLOADS_DIR / course_id / lecture_id / "sources.json"
-    if sources_file.exists():
-        sources_data = read_json(sources_file)
-        lecture_data["sources_summary"] = sources_data.get("full_summary", "")
-        lecture_data["sources_key_ideas"] = sources_data.get("key_ideas", [])
+    # Read files concurrently - on slow filesystems (network mounts, cloud
+    # drives) the wall time becomes that of the slowest file, not the sum
+    with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(loader, path): key
+            for key, path, loader in files_to_load
+        }
+        loaded = {futures[future]: future.result() for future in as_completed(futures)}
+    
+    for key, value in loaded.items():
+        if key == "sources":
+            # Both sources fields come from one sources.json
+            lecture_data["sources_summary"] = value.get("full_summary", "")
+            lecture_data["sources_key_ideas"] = value.get("key_ideas", [])
+        else:
+            lecture_data[key] = value
+        if key in _SAVED_FIELDS:
+            lecture_data["_hashes"][key] = _content_hash(value)
+    
+    _lecture_cache[cache_key] = (token, copy.deepcopy(lecture_data))
     
     return lecture_data
 
@@ -100,7 +213,11 @@ def save_lecture_data(lecture_data: Dict[str, Any]) -> None:
     course_id = lecture_data["course_id"]
     lecture_id = lecture_data["lecture_id"]
     
-    course_manager = CourseManager()
+    # Dropped, not refreshed: the caller's dict may hold edited or transient
+    # keys that are never written, so the next load rebuilds it from disk
+    _lecture_cache.pop((course_id, lecture_id), None)
+    
+    course_manager = get_course_manager()
     
     # Save metadata to courses.json
     course_manager.add_or_update_lecture(
@@ -118,42 +235,27 @@ def save_lecture_data(lecture_data: Dict[str, Any]) -> None:
     output_dir = config.OUTPUTS_DIR / course_id
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    from src.utils.io_utils import write_text
-    
-    # Save draft
-    if lecture_data.get("draft"):
-        write_text(output_dir / f"{lecture_id}_draft.md", lecture_data["draft"])
-    
-    # Save final
-    if lecture_data.get("final"):
-        write_text(output_dir / f"{lecture_id}_final.md", lecture_data["final"])
-    
-    # Save outline
-    if lecture_data.get("outline"):
-        write_text(output_dir / f"{lecture_id}_outline.md", lecture_data["outline"])
-    
-    # Save glossary
-    if lecture_data.get("glossary"):
-        write_text(output_dir / f"{lecture_id}_glossary.md", lecture_data["glossary"])
+    # Save draft, final, outline and glossary; only fields whose content
+    # differs from what was loaded are rewritten
+    for key, suffix, _, _ in _OUTPUT_SUFFIXES:
+        if key in _SAVED_FIELDS:
+            _write_if_changed(lecture_data, key, output_dir / (lecture_id + suffix))
 
 
-def list_all_lectures() -> list[tuple[str, str, Dict]]:
+def list_all_lectures() -> Iterator[Tuple[str, str, Dict]]:
     """
-    List all lectures from all courses.
+    Iterate over all lectures from all courses.
     
-    Returns:
-        List of tuples (course_id, lecture_id, lecture_data)
+    Yields:
+        Tuples (course_id, lecture_id, lecture_data); wrap in list() if len() is needed
     """
-    course_manager = CourseManager()
+    course_manager = get_course_manager()
     courses = course_manager.list_courses()
     
-    all_lectures = []
     for course_id, course_data in courses.items():
         lectures = course_data.get("lectures", {})
         for lecture_id, lecture_data in lectures.items():
-            all_lectures.append((course_id, lecture_id, lecture_data))
-    
-    return all_lectures
+            yield (course_id, lecture_id, lecture_data)
 
 
 
@@ -1,8 +1,54 @@
 """
 Reusable Streamlit UI components.
 """
+import time
+import pandas as pd
 import streamlit as st
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any
+from src.core.course_manager import get_course_manager
+import config
+
+
+def courses_version() -> tuple:
+    """Return (st_mtime_ns, st_size) of courses.json - changes on every write."""
+    stat = config.COURSES_JSON.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@st.cache_data(max_entries=4)
+def _list_courses_cached(version: tuple) -> dict:
+    """
+    List courses, parsed once per version of courses.json.
+    
+    version (from courses_version()) is only part of the cache key: every
+    write to courses.json changes it, so no explicit clear() is needed.
+    """
+    return get_course_manager().list_courses()
+
+
+def list_courses_cached() -> dict:
+    """List courses (cached until courses.json changes; shared by all pages)."""
+    return _list_courses_cached(courses_version())
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _bibliography_frame(bibliography: List[Dict]) -> pd.DataFrame:
+    """
+    Build one table row per bibliography entry.
+    
+    Cached on the entries' contents: the tables are shown on every rerun
+    once a bibliography exists, but the frame only changes with a new search.
+    """
+    return pd.DataFrame(
+        {
+            "Название": [entry.get('title', 'Untitled') for entry in bibliography],
+            "Авторы": [', '.join(entry.get('authors', [])) for entry in bibliography],
+            "Год": [str(entry.get('year', 'Unknown')) for entry in bibliography],
+            "Источник": [entry.get('source', 'Unknown') for entry in bibliography],
+            "DOI": [entry.get('doi') or "" for entry in bibliography],
+        },
+        index=range(1, len(bibliography) + 1),
+    )
 
 
 def display_bibliography_table(bibliography: List[Dict], title: str = "Bibliography"):
@@ -12,14 +58,9 @@ def display_bibliography_table(bibliography: List[Dict], title: str = "Bibliogra
         return
     
     st.subheader(title)
-    
-    for i, entry in enumerate(bibliography, 1):
-        with st.expander(f"{i}. {entry.get('title', 'Untitled')}"):
-            st.write(f"**Авторы:** {', '.join(entry.get('authors', []))}")
-            st.write(f"**Год:** {entry.get('year', 'Unknown')}")
-            st.write(f"**Источник:** {entry.get('source', 'Unknown')}")
-            if entry.get('doi'):
-                st.write(f"**DOI:** {entry['doi']}")
+    # A single dataframe element (sent as Arrow), replacing the earlier
+    # expander + markdown block per entry: one element instead of 2N
+    st.dataframe(_bibliography_frame(bibliography), use_container_width=True)
 
 
 def display_key_ideas(key_ideas: List[str]):
@@ -37,3 +78,23 @@ def display_summary(summary: str, title: str = "Резюме"):
     st.subheader(title)
     st.markdown(summary)
 
+
+def stream_preview(placeholder, min_interval: float = 0.3) -> Callable[[str], None]:
+    """
+    Create on_token callback that shows streamed LLM text in a placeholder.
+    
+    The placeholder is refreshed at most every min_interval seconds, so a
+    long lecture is not re-sent to the browser after every token.
+    """
+    parts = []
+    last_update = 0.0
+    
+    def on_token(token: str) -> None:
+        nonlocal last_update
+        parts.append(token)
+        now = time.monotonic()
+        if now - last_update >= min_interval:
+            placeholder.markdown("".join(parts))
+            last_update = now
+    
+    return on_token
@@ -2,17 +2,34 @@
 Course Setup Page for Streamlit.
 """
 import streamlit as st
-from src.core.course_manager import CourseManager
+from src.core.course_manager import get_course_manager
+from src.core.lecture_storage import delete_lecture
+from src.ui.components import courses_version, list_courses_cached
 from src.utils.io_utils import read_text, write_text
 import config
 
 
+@st.cache_data(max_entries=32)
+def get_sorted_lectures(course_id: str, version: tuple) -> list:
+    """
+    Get course lectures sorted by order.
+    
+    version (from courses_version()) is only part of the cache key: any
+    save to courses.json changes it, so a stale list is never returned.
+    """
+    course = get_course_manager().get_course(course_id) or {}
+    return sorted(
+        course.get("lectures", {}).items(),
+        key=lambda x: x[1].get("order", 0)
+    )
+
+
 def render_course_setup_page():
     """Render the course setup page."""
     st.title("📚 Управление курсами")
     
-    course_manager = CourseManager()
-    courses = course_manager.list_courses()
+    course_manager = get_course_manager()
+    courses = list_courses_cached()
     
     # Sidebar for course selection
     st.sidebar.header("Курсы")
@@ -106,10 +123,10 @@ def render_course_setup_page():
         if not lectures:
             st.info("В этом курсе пока нет лекций. Создайте лекции на странице 'Мастер лекций'.")
         else:
-            # Sort by order
-            sorted_lectures = sorted(
-                lectures.items(),
-                key=lambda x: x[1].get("order", 0)
+            # Sort by order (cached until courses.json changes)
+            sorted_lectures = get_sorted_lectures(
+                selected_course_id,
+                courses_version()
             )
             
             for lecture_id, lecture_data in sorted_lectures:
@@ -133,7 +150,6 @@ def render_course_setup_page():
                                 st.write(f"- Recent keywords: {metadata['recent_keywords']}")
                 
                 with col2:
-                    from src.core.lecture_storage import delete_lecture
                     col_edit, col_delete = st.columns(2)
                     
                     with col_edit:
@@ -1,27 +1,340 @@
 """
 Lecture Wizard Page for Streamlit.
 """
+import io
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import tempfile
-import os
-from src.core.course_manager import CourseManager
-from src.core.lecture_pipeline import LecturePipeline
-from src.ui.components import display_bibliography_table, display_key_ideas, display_summary
-from src.utils.io_utils import read_text, read_json
+import traceback
+from src.core.brief_draft_generator import generate_brief_draft, generate_lecture_summary
+from src.core.course_manager import get_course_manager
+from src.llm.grok_client import GROK_API_KEY
+from src.llm.model_registry import DEFAULT_MODEL_INDEX, MODEL_REGISTRY
+from src.ui.components import courses_version, display_bibliography_table, display_key_ideas, display_summary, list_courses_cached, stream_preview
 from src.export.docx_exporter import export_lecture_to_docx
-import config
-import uuid
+from src.utils.text_postprocessing import count_words, split_comma_list
+import re
+import secrets
+
+# Characters dropped from lecture titles to build download file names
+# (\w is Unicode-aware, so Cyrillic titles are kept)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\- ]")
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _get_lecture_cached(course_id: str, lecture_id: str, courses_version: tuple) -> dict:
+    """Get lecture metadata, looked up once per version of courses.json."""
+    return get_course_manager().get_lecture(course_id, lecture_id)
+
+
+def _get_lecture(course_id: str, lecture_id: str) -> dict:
+    """
+    Get lecture metadata (cached until courses.json changes).
+    
+    Keyed on the current version of courses.json, so metadata saved
+    earlier in the same rerun is seen without clearing the cache.
+    """
+    return _get_lecture_cached(course_id, lecture_id, courses_version())
+
+
+def _pipeline():
+    """
+    Get the shared pipeline, importing it on first use.
+    
+    The pipeline module pulls in the LLM SDKs, PDF parsers and OpenAlex
+    client, so pages import it only once a generation step actually runs.
+    """
+    from src.core.lecture_pipeline import get_lecture_pipeline
+    return get_lecture_pipeline()
+
+
+def _sync_outline() -> None:
+    """Copy the edited outline from its text area into session state."""
+    st.session_state.outline = st.session_state.outline_editor
+
+
+def _gamma_prompt_bytes() -> bytes:
+    """
+    Get the Gamma prompt as UTF-8 bytes for the download button.
+    
+    The encoded copy is kept in session state next to the prompt it came
+    from; the identity check is O(1), so reruns reuse it until a new prompt
+    is generated instead of re-encoding (or re-hashing) the whole text.
+    """
+    prompt = st.session_state.gamma_prompt
+    cached = st.session_state.get("gamma_prompt_bytes")
+    if cached is None or cached[0] is not prompt:
+        cached = (prompt, prompt.encode("utf-8"))
+        st.session_state.gamma_prompt_bytes = cached
+    return cached[1]
+
+
+def _bibliography_sections() -> tuple:
+    """
+    Get the found bibliography as (heading, entries) sections for the DOCX export.
+    
+    The exporter formats the entries itself, so no bibliography text is
+    joined here only to be split back into lines.
+    """
+    bib = st.session_state.get("bibliography") or {}
+    return tuple(
+        (heading, tuple(entries))
+        for heading, entries in (
+            ("Основные работы (Core):", bib.get("core")),
+            ("Недавние работы (Recent):", bib.get("recent")),
+        )
+        if entries
+    )
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _build_docx_bytes(
+    title: str,
+    subtitle: str,
+    keywords: tuple,
+    lecture_text: str,
+    bibliography_sections: tuple = ()
+) -> bytes:
+    """
+    Build a lecture DOCX in memory, once per distinct content.
+    
+    The export blocks run on every rerun of the outputs section; hashing the
+    text for the cache key is far cheaper than re-serializing the document.
+    """
+    buffer = io.BytesIO()
+    export_lecture_to_docx(
+        title=title,
+        subtitle=subtitle,
+        keywords=list(keywords),
+        lecture_text=lecture_text,
+        file_path=buffer,
+        bibliography_sections=bibliography_sections
+    )
+    return buffer.getvalue()
+
+
+# st.fragment is stable since Streamlit 1.37; fall back to the experimental
+# name on older releases and to a plain call if neither exists.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda func: func)
+
+
+@_fragment
+def _render_outputs(selected_course_id: str, lecture_id: str) -> None:
+    """
+    Render the generated texts with their DOCX downloads.
+    
+    Runs as a fragment, so a download click reruns only this section
+    instead of the whole wizard (and every expensive block above it).
+    """
+    # Lecture metadata and file name shared by all export blocks
+    lecture = _get_lecture(selected_course_id, lecture_id) or {}
+    lecture_title = lecture.get("title", "Лекция")
+    lecture_subtitle = lecture.get("subtitle", "")
+    lecture_keywords = tuple(lecture.get("keywords", []))
+    safe_title = _UNSAFE_FILENAME_CHARS.sub("", lecture_title).rstrip()
+    
+    if "brief_draft" in st.session_state:
+        with st.expander("Краткий черновик лекции"):
+            st.markdown(st.session_state.brief_draft)
+            
+            # Export brief draft to DOCX
+            st.subheader("Экспорт краткого черновика")
+            try:
+                docx_data = _build_docx_bytes(
+                    f"{lecture_title} (Краткий вариант)",
+                    lecture_subtitle,
+                    lecture_keywords,
+                    st.session_state.brief_draft
+                )
+                
+                file_name = f"{safe_title}_brief.docx" if safe_title else f"lecture_{lecture_id}_brief.docx"
+                
+                st.download_button(
+                    label="📥 Скачать краткий черновик в .docx",
+                    data=docx_data,
+                    file_name=file_name,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+            except Exception as e:
+                st.error(f"Ошибка при создании DOCX: {str(e)}")
+    
+    if "lecture_summary" in st.session_state:
+        with st.expander("✨ Резюме лекции (600–800 слов)"):
+            st.markdown(st.session_state.lecture_summary)
+            
+            # Export lecture summary to DOCX
+            st.subheader("Экспорт резюме")
+            try:
+                docx_data = _build_docx_bytes(
+                    f"{lecture_title} (Резюме)",
+                    lecture_subtitle,
+                    lecture_keywords,
+                    st.session_state.lecture_summary
+                )
+                
+                file_name = f"{safe_title}_summary.docx" if safe_title else f"lecture_{lecture_id}_summary.docx"
+                
+                st.download_button(
+                    label="📥 Скачать резюме в .docx",
+                    data=docx_data,
+                    file_name=file_name,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+            except Exception as e:
+                st.error(f"Ошибка при создании DOCX: {str(e)}")
+    
+    if "draft" in st.session_state:
+        with st.expander("Черновик лекции"):
+            st.markdown(st.session_state.draft)
+            
+            # Export draft to DOCX
+            st.subheader("Экспорт черновика")
+            try:
+                docx_data = _build_docx_bytes(
+                    f"{lecture_title} (Черновик)",
+                    lecture_subtitle,
+                    lecture_keywords,
+                    st.session_state.draft
+                )
+                
+                file_name = f"{safe_title}_draft.docx" if safe_title else f"lecture_{lecture_id}_draft.docx"
+                
+                st.download_button(
+                    label="📥 Скачать черновик в .docx",
+                    data=docx_data,
+                    file_name=file_name,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+            except Exception as e:
+                st.error(f"Ошибка при создании DOCX: {str(e)}")
+    
+    if "final" in st.session_state:
+        with st.expander("Финальная лекция"):
+            st.markdown(st.session_state.final)
+            
+            # Export to DOCX button
+            st.subheader("Экспорт")
+            
+            # Export to DOCX
+            try:
+                # Export lecture to DOCX (cached per content)
+                docx_data = _build_docx_bytes(
+                    lecture_title,
+                    lecture_subtitle,
+                    lecture_keywords,
+                    st.session_state.final,
+                    _bibliography_sections()
+                )
+                
+                file_name = f"{safe_title}.docx" if safe_title else f"lecture_{lecture_id}.docx"
+                
+                # Create download button
+                st.download_button(
+                    label="📥 Скачать лекцию в .docx",
+                    data=docx_data,
+                    file_name=file_name,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+                    
+            except Exception as e:
+                st.error(f"Ошибка при создании DOCX файла: {str(e)}")
+    
+    if "glossary" in st.session_state:
+        with st.expander("Глоссарий"):
+            st.markdown(st.session_state.glossary)
+
+
+def _finalize_lecture(
+    course_id: str,
+    lecture_id: str,
+    draft: str,
+    model_name: str,
+    sources_keypoints: list,
+    stream_area
+) -> str:
+    """
+    Run the revision -> glossary -> Gamma prompt chain on a draft.
+    
+    Each result goes to session state as soon as it is produced, so a later
+    failing step does not discard the earlier ones.
+    
+    Returns:
+        Revised (final) lecture text
+    """
+    try:
+        revised = _pipeline().run_revision_step(
+            course_id=course_id,
+            lecture_id=lecture_id,
+            raw_lecture_text=draft,
+            model_name=model_name,
+            on_token=stream_preview(stream_area)
+        )
+        st.session_state.final = revised
+        glossary = _pipeline().run_glossary_step(
+            course_id=course_id,
+            lecture_id=lecture_id,
+            final_lecture_text=revised,
+            on_token=stream_preview(stream_area)
+        )
+        st.session_state.glossary = glossary
+    finally:
+        stream_area.empty()
+    st.session_state.gamma_prompt = _pipeline().run_presentation_prompt_step(
+        course_id=course_id,
+        lecture_id=lecture_id,
+        final_lecture_text=revised,
+        glossary_text=glossary,
+        uploaded_sources_keypoints=sources_keypoints
+    )
+    return revised
+
+
+def _run_alongside(side_tasks: dict, chain) -> bool:
+    """
+    Run chain() on the script thread while independent LLM requests run on worker threads.
+    
+    Args:
+        side_tasks: Session state key -> (label, function, kwargs); the
+            functions must not call st.*, their results are stored here
+        chain: Main steps (may use st.*, stores its own results)
+    
+    A failing chain is reported at once, without waiting for the side tasks
+    (their results are dropped); a failing side task is reported on its own
+    and does not touch anything the chain produced.
+    
+    Returns:
+        True if the chain and every side task succeeded
+    """
+    executor = ThreadPoolExecutor(max_workers=len(side_tasks))
+    futures = {
+        key: (label, executor.submit(func, **kwargs))
+        for key, (label, func, kwargs) in side_tasks.items()
+    }
+    try:
+        chain()
+    except Exception as e:
+        executor.shutdown(wait=False, cancel_futures=True)
+        st.error(f"Ошибка: {str(e)}")
+        return False
+    
+    ok = True
+    for key, (label, future) in futures.items():
+        try:
+            st.session_state[key] = future.result()
+        except Exception as e:
+            st.error(f"Ошибка ({label}): {str(e)}")
+            ok = False
+    executor.shutdown()
+    return ok
 
 
 def render_lecture_wizard_page():
     """Render the lecture wizard page."""
     st.title("🎓 Мастер создания лекций")
     
-    course_manager = CourseManager()
-    pipeline = LecturePipeline()
+    course_manager = get_course_manager()
     
-    courses = course_manager.list_courses()
+    courses = list_courses_cached()
     
     if not courses:
         st.warning("Сначала создайте курс на странице 'Управление курсами'.")
@@ -37,7 +350,7 @@ def render_lecture_wizard_page():
     
     # Initialize session state
     if "lecture_id" not in st.session_state:
-        st.session_state.lecture_id = str(uuid.uuid4())[:8]
+        st.session_state.lecture_id = secrets.token_hex(4)
     
     lecture_id = st.session_state.lecture_id
     
@@ -59,7 +372,7 @@ def render_lecture_wizard_page():
         save_metadata = st.form_submit_button("Сохранить метаданные")
         
         if save_metadata:
-            keywords = [k.strip() for k in keywords_input.split(",") if k.strip()]
+            keywords = split_comma_list(keywords_input)
             course_manager.add_or_update_lecture(
                 course_id=selected_course_id,
                 lecture_id=lecture_id,
@@ -86,28 +399,40 @@ def render_lecture_wizard_page():
         if st.button("Обработать загруженные файлы"):
             with st.spinner("Обработка файлов..."):
                 try:
-                    sources_data = pipeline.run_uploaded_sources_step(
+                    progress_bar = st.progress(0.0, text="Извлечение текста из файлов...")
+                    sources_data = _pipeline().run_uploaded_sources_step(
                         course_id=selected_course_id,
                         lecture_id=lecture_id,
-                        uploaded_files=uploaded_files
+                        uploaded_files=uploaded_files,
+                        progress_callback=lambda done, total: progress_bar.progress(
+                            done / total, text=f"Извлечён текст: {done} из {total} файлов"
+                        )
                     )
                     st.session_state.sources_data = sources_data
-                    st.success("Файлы обработаны!")
+                    skipped_files = sources_data.get("skipped_files")
+                    if skipped_files:
+                        st.warning(
+                            f"Файлы обработаны, но из {len(skipped_files)} файлов не удалось извлечь текст "
+                            f"(резюме построено без них): {', '.join(skipped_files)}"
+                        )
+                    else:
+                        st.success("Файлы обработаны!")
                 except Exception as e:
                     st.error(f"Ошибка обработки: {str(e)}")
     
+    # Processed sources, bound once per rerun and reused by the later steps
+    sources_data = st.session_state.get("sources_data", {})
+    
     # Display sources summary if available
-    if "sources_data" in st.session_state:
-        sources_data = st.session_state.sources_data
-        if sources_data.get("full_summary"):
-            display_summary(sources_data["full_summary"], "Резюме загруженных источников")
-        if sources_data.get("key_ideas"):
-            display_key_ideas(sources_data["key_ideas"])
+    if sources_data.get("full_summary"):
+        display_summary(sources_data["full_summary"], "Резюме загруженных источников")
+    if sources_data.get("key_ideas"):
+        display_key_ideas(sources_data["key_ideas"])
     
     # Step 4: OpenAlex Bibliography
     st.header("Шаг 4: Библиография OpenAlex")
     
-    lecture = course_manager.get_lecture(selected_course_id, lecture_id)
+    lecture = _get_lecture(selected_course_id, lecture_id)
     
     # Load saved OpenAlex parameters or use defaults
     if lecture:
@@ -139,7 +464,8 @@ def render_lecture_wizard_page():
         key="recent_keywords_input"
     )
     
-    # Save to session state
+    # Keep a copy outside the widget keys: Streamlit drops a widget's key when
+    # the page is switched away, and the defaults above restore from these
     st.session_state["core_keywords"] = core_keywords
     st.session_state["core_authors"] = core_authors
     st.session_state["recent_keywords"] = recent_keywords
@@ -166,7 +492,7 @@ def render_lecture_wizard_page():
     if st.button("Сгенерировать библиографию"):
         with st.spinner("Поиск в OpenAlex..."):
             try:
-                bibliography = pipeline.run_bibliography_step(
+                bibliography = _pipeline().run_bibliography_step(
                     course_id=selected_course_id,
                     lecture_id=lecture_id,
                     core_keywords=core_keywords,
@@ -188,7 +514,6 @@ def render_lecture_wizard_page():
                     st.warning("⚠️ OpenAlex не вернул результатов. Попробуйте упростить ключевые слова или изменить параметры поиска.")
             except Exception as e:
                 st.error(f"Ошибка: {str(e)}")
-                import traceback
                 st.error(f"Детали ошибки: {traceback.format_exc()}")
     
     if "bibliography" in st.session_state:
@@ -209,7 +534,7 @@ def render_lecture_wizard_page():
         if st.button("Создать резюме библиографии"):
             with st.spinner("Генерация резюме..."):
                 try:
-                    bib_summary = pipeline.run_bibliography_summary_step(
+                    bib_summary = _pipeline().run_bibliography_summary_step(
                         course_id=selected_course_id,
                         lecture_id=lecture_id,
                         bibliography=st.session_state.bibliography
@@ -233,10 +558,9 @@ def render_lecture_wizard_page():
         
         with st.spinner("Генерация плана..."):
             try:
-                sources_data = st.session_state.get("sources_data", {})
                 bib_summary = st.session_state.get("bibliography_summary", "")
                 
-                outline = pipeline.run_outline_step(
+                outline = _pipeline().run_outline_step(
                     course_id=selected_course_id,
                     lecture_id=lecture_id,
                     uploaded_sources_summary=sources_data.get("full_summary", ""),
@@ -244,59 +568,61 @@ def render_lecture_wizard_page():
                     bibliography_summary=bib_summary
                 )
                 st.session_state.outline = outline
+                st.session_state.outline_editor = outline
                 st.success("План сгенерирован!")
             except Exception as e:
                 st.error(f"Ошибка: {str(e)}")
     
     if "outline" in st.session_state:
         st.subheader("План лекции")
-        editable_outline = st.text_area(
+        # Widget state lives under its own key (Streamlit drops widget keys
+        # when the page is left); edits are copied to "outline" only when
+        # the text actually changes
+        if "outline_editor" not in st.session_state:
+            st.session_state.outline_editor = st.session_state.outline
+        st.text_area(
             "План (можно редактировать)",
-            value=st.session_state.outline,
-            height=400
+            height=400,
+            key="outline_editor",
+            on_change=_sync_outline
         )
-        if editable_outline != st.session_state.outline:
-            st.session_state.outline = editable_outline
     
     # Step 7: Draft → Revision → Glossary
     st.header("Шаг 7: Генерация лекции")
     
     # Model selection
     st.subheader("Выбор модели для генерации")
-    from src.llm.model_registry import MODEL_REGISTRY
-    
-    # Set default index to grok-4-fast-reasoning if available
-    default_index = 0
-    if "grok-4-fast-reasoning" in MODEL_REGISTRY:
-        default_index = MODEL_REGISTRY.index("grok-4-fast-reasoning")
     
     selected_model = st.selectbox(
         "Выберите модель",
         options=MODEL_REGISTRY,
-        index=default_index,
+        index=DEFAULT_MODEL_INDEX,
         help="Grok reasoning — лучший для сложных задач и PDF. DeepSeek — быстрый и экономичный. GPT — качественный стиль."
     )
     
     # Display selected model
     st.info(f"📌 Модель, которая будет использоваться: **{selected_model}**")
     
-    # Store in session state
-    st.session_state["model_choice"] = selected_model
+    # Check model availability (the key call_grok uses, read once at import)
+    if selected_model.startswith("grok") and not GROK_API_KEY:
+        st.warning("⚠️ GROK_API_KEY не установлен в переменных окружения. Grok недоступен.")
+        selected_model = "deepseek-chat"
     
-    # Check model availability
-    if selected_model.startswith("grok"):
-        try:
-            import os
-            if not os.getenv("GROK_API_KEY"):
-                st.warning("⚠️ GROK_API_KEY не установлен в переменных окружения. Grok недоступен.")
-                selected_model = "deepseek-chat"
-                st.session_state["model_choice"] = selected_model
-        except:
-            pass
+    # Lecture metadata shared by the generation buttons below
+    lecture = _get_lecture(selected_course_id, lecture_id) or {}
+    metadata = {
+        "title": lecture.get("title", ""),
+        "subtitle": lecture.get("subtitle", ""),
+        "keywords": lecture.get("keywords", [])
+    }
+    target_length = lecture.get("target_length", 4000)
     
     # Create 5 columns for all generation buttons
     col1, col2, col3, col4, col5 = st.columns(5)
     
+    # Full-width area below the buttons where generated text appears as it streams in
+    stream_area = st.empty()
+    
     with col1:
         if st.button("Сгенерировать краткий черновик"):
             if "outline" not in st.session_state:
@@ -304,18 +630,7 @@ def render_lecture_wizard_page():
             else:
                 with st.spinner("Генерация краткого черновика..."):
                     try:
-                        from src.core.brief_draft_generator import generate_brief_draft
-                        
-                        # Get lecture metadata
-                        lecture = course_manager.get_lecture(selected_course_id, lecture_id)
-                        metadata = {
-                            "title": lecture.get("title", "") if lecture else "",
-                            "subtitle": lecture.get("subtitle", "") if lecture else "",
-                            "keywords": lecture.get("keywords", []) if lecture else []
-                        }
-                        
                         # Get PDF summary if available
-                        sources_data = st.session_state.get("sources_data", {})
                         pdf_summary = sources_data.get("full_summary", "")
                         
                         # Generate brief draft
@@ -340,8 +655,15 @@ def render_lecture_wizard_page():
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         
-                        sources_data = st.session_state.get("sources_data", {})
-                        bibliography = st.session_state.get("bibliography", {"core": [], "recent": []})
+                        # Step inputs gathered once from session state
+                        draft_args = {
+                            "course_id": selected_course_id,
+                            "lecture_id": lecture_id,
+                            "outline_text": st.session_state.outline,
+                            "uploaded_sources_keypoints": sources_data.get("key_ideas", []),
+                            "bibliography": st.session_state.get("bibliography", {"core": [], "recent": []}),
+                            "model_name": selected_model
+                        }
                         
                         status_text.text("🔄 Инициализация генерации...")
                         progress_bar.progress(10)
@@ -349,47 +671,24 @@ def render_lecture_wizard_page():
                         status_text.text("📝 Генерация основного текста...")
                         progress_bar.progress(30)
                         
-                        draft = pipeline.run_draft_step(
-                            course_id=selected_course_id,
-                            lecture_id=lecture_id,
-                            outline_text=st.session_state.outline,
-                            uploaded_sources_keypoints=sources_data.get("key_ideas", []),
-                            bibliography=bibliography,
-                            model_name=selected_model
-                        )
+                        draft = _pipeline().run_draft_step(**draft_args, on_token=stream_preview(stream_area))
+                        stream_area.empty()
                         
-                        from src.utils.text_postprocessing import count_words
                         word_count = count_words(draft)
                         
-                        # Get target length for display
-                        lecture = course_manager.get_lecture(selected_course_id, lecture_id)
-                        target_length = lecture.get("target_length", 4000) if lecture else 4000
-                        
+                        # run_draft_step already expands a short draft towards the target
                         if word_count >= target_length:
                             status_text.text(f"✅ Черновик готов: {word_count} слов (цель: {target_length})")
                         else:
-                            status_text.text(f"⚙️ Расширение до целевого объёма... ({word_count} → {target_length} слов)")
-                            progress_bar.progress(70)
-                            # Pipeline will handle expansion automatically
-                            draft = pipeline.run_draft_step(
-                                course_id=selected_course_id,
-                                lecture_id=lecture_id,
-                                outline_text=st.session_state.outline,
-                                uploaded_sources_keypoints=sources_data.get("key_ideas", []),
-                                bibliography=bibliography,
-                                model_name=selected_model
-                            )
-                            final_word_count = count_words(draft)
-                            status_text.text(f"✅ Черновик готов: {final_word_count} слов (цель: {target_length})")
+                            status_text.text(f"⚠️ Черновик готов: {word_count} слов (цель {target_length} не достигнута)")
                         
                         progress_bar.progress(100)
                         st.session_state.draft = draft
-                        st.success(f"Черновик создан! Объём: {count_words(draft)} слов")
+                        st.success(f"Черновик создан! Объём: {word_count} слов")
                         progress_bar.empty()
                         status_text.empty()
                     except Exception as e:
                         st.error(f"Ошибка: {str(e)}")
-                        import traceback
                         st.error(f"Детали: {traceback.format_exc()}")
     
     with col3:
@@ -408,43 +707,30 @@ def render_lecture_wizard_page():
                         status_text.text("✏️ Редактирование и стилизация...")
                         progress_bar.progress(40)
                         
-                        revised = pipeline.run_revision_step(
+                        revised = _pipeline().run_revision_step(
                             course_id=selected_course_id,
                             lecture_id=lecture_id,
                             raw_lecture_text=st.session_state.draft,
-                            model_name=selected_model
+                            model_name=selected_model,
+                            on_token=stream_preview(stream_area)
                         )
+                        stream_area.empty()
                         
-                        from src.utils.text_postprocessing import count_words
                         word_count = count_words(revised)
                         
-                        # Get target length for display
-                        lecture = course_manager.get_lecture(selected_course_id, lecture_id)
-                        target_length = lecture.get("target_length", 4000) if lecture else 4000
-                        
+                        # run_revision_step already expands a short revision towards the target
                         if word_count >= target_length:
                             status_text.text(f"✅ Редактура завершена: {word_count} слов (цель: {target_length})")
                         else:
-                            status_text.text(f"⚙️ Расширение до целевого объёма... ({word_count} → {target_length} слов)")
-                            progress_bar.progress(70)
-                            # Pipeline will handle expansion automatically
-                            revised = pipeline.run_revision_step(
-                                course_id=selected_course_id,
-                                lecture_id=lecture_id,
-                                raw_lecture_text=st.session_state.draft,
-                                model_name=selected_model
-                            )
-                            final_word_count = count_words(revised)
-                            status_text.text(f"✅ Редактура завершена: {final_word_count} слов (цель: {target_length})")
+                            status_text.text(f"⚠️ Редактура завершена: {word_count} слов (цель {target_length} не достигнута)")
                         
                         progress_bar.progress(100)
                         st.session_state.final = revised
-                        st.success(f"Финальная версия готова! Объём: {count_words(revised)} слов")
+                        st.success(f"Финальная версия готова! Объём: {word_count} слов")
                         progress_bar.empty()
                         status_text.empty()
                     except Exception as e:
                         st.error(f"Ошибка: {str(e)}")
-                        import traceback
                         st.error(f"Детали: {traceback.format_exc()}")
     
     with col4:
@@ -454,18 +740,7 @@ def render_lecture_wizard_page():
             else:
                 with st.spinner("Генерация резюме лекции (600–800 слов)..."):
                     try:
-                        from src.core.brief_draft_generator import generate_lecture_summary
-                        
-                        # Get lecture metadata
-                        lecture = course_manager.get_lecture(selected_course_id, lecture_id)
-                        metadata = {
-                            "title": lecture.get("title", "") if lecture else "",
-                            "subtitle": lecture.get("subtitle", "") if lecture else "",
-                            "keywords": lecture.get("keywords", []) if lecture else []
-                        }
-                        
                         # Get PDF summary if available
-                        sources_data = st.session_state.get("sources_data", {})
                         pdf_summary = sources_data.get("full_summary", "")
                         
                         # Generate lecture summary
@@ -487,242 +762,93 @@ def render_lecture_wizard_page():
             else:
                 with st.spinner("Извлечение глоссария..."):
                     try:
-                        glossary = pipeline.run_glossary_step(
+                        glossary = _pipeline().run_glossary_step(
                             course_id=selected_course_id,
                             lecture_id=lecture_id,
-                            final_lecture_text=st.session_state.final
+                            final_lecture_text=st.session_state.final,
+                            on_token=stream_preview(stream_area)
                         )
+                        stream_area.empty()
                         st.session_state.glossary = glossary
                         st.success("Глоссарий создан!")
                     except Exception as e:
                         st.error(f"Ошибка: {str(e)}")
     
-    # Display outputs
-    if "brief_draft" in st.session_state:
-        with st.expander("Краткий черновик лекции"):
-            st.markdown(st.session_state.brief_draft)
-            
-            # Export brief draft to DOCX
-            st.subheader("Экспорт краткого черновика")
-            try:
-                import tempfile
-                from src.export.docx_exporter import export_lecture_to_docx
-                
-                lecture = course_manager.get_lecture(selected_course_id, lecture_id)
-                lecture_title = lecture.get("title", "Лекция") if lecture else "Лекция"
-                lecture_subtitle = lecture.get("subtitle", "") if lecture else ""
-                lecture_keywords = lecture.get("keywords", []) if lecture else []
-                
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                    tmp_path = tmp.name
-                
-                export_lecture_to_docx(
-                    title=f"{lecture_title} (Краткий вариант)",
-                    subtitle=lecture_subtitle,
-                    keywords=lecture_keywords,
-                    lecture_text=st.session_state.brief_draft,
-                    bibliography=None,
-                    file_path=tmp_path
-                )
-                
-                with open(tmp_path, "rb") as f:
-                    docx_data = f.read()
-                
-                safe_title = "".join(c for c in lecture_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                file_name = f"{safe_title}_brief.docx" if safe_title else f"lecture_{lecture_id}_brief.docx"
-                
-                st.download_button(
-                    label="📥 Скачать краткий черновик в .docx",
-                    data=docx_data,
-                    file_name=file_name,
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
-                
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
-            except Exception as e:
-                st.error(f"Ошибка при создании DOCX: {str(e)}")
-    
-    if "lecture_summary" in st.session_state:
-        with st.expander("✨ Резюме лекции (600–800 слов)"):
-            st.markdown(st.session_state.lecture_summary)
-            
-            # Export lecture summary to DOCX
-            st.subheader("Экспорт резюме")
-            try:
-                import tempfile
-                from src.export.docx_exporter import export_lecture_to_docx
-                
-                lecture = course_manager.get_lecture(selected_course_id, lecture_id)
-                lecture_title = lecture.get("title", "Лекция") if lecture else "Лекция"
-                lecture_subtitle = lecture.get("subtitle", "") if lecture else ""
-                lecture_keywords = lecture.get("keywords", []) if lecture else []
-                
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                    tmp_path = tmp.name
-                
-                export_lecture_to_docx(
-                    title=f"{lecture_title} (Резюме)",
-                    subtitle=lecture_subtitle,
-                    keywords=lecture_keywords,
-                    lecture_text=st.session_state.lecture_summary,
-                    bibliography=None,
-                    file_path=tmp_path
-                )
-                
-                with open(tmp_path, "rb") as f:
-                    docx_data = f.read()
-                
-                safe_title = "".join(c for c in lecture_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                file_name = f"{safe_title}_summary.docx" if safe_title else f"lecture_{lecture_id}_summary.docx"
-                
-                st.download_button(
-                    label="📥 Скачать резюме в .docx",
-                    data=docx_data,
-                    file_name=file_name,
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
-                
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
-            except Exception as e:
-                st.error(f"Ошибка при создании DOCX: {str(e)}")
-    
-    if "draft" in st.session_state:
-        with st.expander("Черновик лекции"):
-            st.markdown(st.session_state.draft)
-            
-            # Export draft to DOCX
-            st.subheader("Экспорт черновика")
-            try:
-                import tempfile
-                from src.export.docx_exporter import export_lecture_to_docx
-                
-                lecture = course_manager.get_lecture(selected_course_id, lecture_id)
-                lecture_title = lecture.get("title", "Лекция") if lecture else "Лекция"
-                lecture_subtitle = lecture.get("subtitle", "") if lecture else ""
-                lecture_keywords = lecture.get("keywords", []) if lecture else []
-                
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                    tmp_path = tmp.name
-                
-                export_lecture_to_docx(
-                    title=f"{lecture_title} (Черновик)",
-                    subtitle=lecture_subtitle,
-                    keywords=lecture_keywords,
-                    lecture_text=st.session_state.draft,
-                    bibliography=None,
-                    file_path=tmp_path
-                )
-                
-                with open(tmp_path, "rb") as f:
-                    docx_data = f.read()
-                
-                safe_title = "".join(c for c in lecture_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                file_name = f"{safe_title}_draft.docx" if safe_title else f"lecture_{lecture_id}_draft.docx"
-                
-                st.download_button(
-                    label="📥 Скачать черновик в .docx",
-                    data=docx_data,
-                    file_name=file_name,
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
-                
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
-            except Exception as e:
-                st.error(f"Ошибка при создании DOCX: {str(e)}")
-    
-    if "final" in st.session_state:
-        with st.expander("Финальная лекция"):
-            st.markdown(st.session_state.final)
-            
-            # Export to DOCX button
-            st.subheader("Экспорт")
-            
-            # Get lecture metadata
-            lecture = course_manager.get_lecture(selected_course_id, lecture_id)
-            lecture_title = lecture.get("title", "Лекция") if lecture else "Лекция"
-            lecture_subtitle = lecture.get("subtitle", "") if lecture else ""
-            lecture_keywords = lecture.get("keywords", []) if lecture else []
-            
-            # Format bibliography if available
-            bibliography_text = None
-            if "bibliography" in st.session_state:
-                bib = st.session_state.bibliography
-                bib_lines = []
-                
-                # Core bibliography
-                if bib.get("core"):
-                    bib_lines.append("Основные работы (Core):")
-                    for entry in bib["core"]:
-                        authors = ", ".join(entry.get("authors", []))
-                        year = entry.get("year", "")
-                        title = entry.get("title", "")
-                        bib_lines.append(f"{authors} ({year}). {title}")
-                    bib_lines.append("")
-                
-                # Recent bibliography
-                if bib.get("recent"):
-                    bib_lines.append("Недавние работы (Recent):")
-                    for entry in bib["recent"]:
-                        authors = ", ".join(entry.get("authors", []))
-                        year = entry.get("year", "")
-                        title = entry.get("title", "")
-                        bib_lines.append(f"{authors} ({year}). {title}")
-                
-                bibliography_text = "\n".join(bib_lines) if bib_lines else None
-            
-            # Export to DOCX
-            try:
-                # Create temporary file for export
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                    tmp_path = tmp.name
-                
-                # Export lecture to DOCX
-                export_lecture_to_docx(
-                    title=lecture_title,
-                    subtitle=lecture_subtitle,
-                    keywords=lecture_keywords,
-                    lecture_text=st.session_state.final,
-                    bibliography=bibliography_text,
-                    file_path=tmp_path
-                )
-                
-                # Read the file data
-                with open(tmp_path, "rb") as f:
-                    docx_data = f.read()
-                
-                # Clean filename
-                safe_title = "".join(c for c in lecture_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                file_name = f"{safe_title}.docx" if safe_title else f"lecture_{lecture_id}.docx"
-                
-                # Create download button
-                st.download_button(
-                    label="📥 Скачать лекцию в .docx",
-                    data=docx_data,
-                    file_name=file_name,
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                )
+    # Generate everything from the outline: draft -> revision -> glossary ->
+    # Gamma prompt is a chain, while the brief draft and the lecture summary
+    # only need the metadata, so both run on worker threads alongside it
+    if st.button("Сгенерировать всё (черновик, редактура, глоссарий, краткий вариант, резюме, промпт Gamma)"):
+        if "outline" not in st.session_state:
+            st.warning("Сначала сгенерируйте план.")
+        else:
+            with st.spinner("Генерация всех материалов лекции (это может занять время)..."):
+                pdf_summary = sources_data.get("full_summary", "")
+                side_tasks = {
+                    "brief_draft": ("краткий черновик", generate_brief_draft, {
+                        "metadata": metadata,
+                        "pdf_summary": pdf_summary,
+                        "model_name": selected_model
+                    }),
+                    "lecture_summary": ("резюме", generate_lecture_summary, {
+                        "metadata": metadata,
+                        "pdf_summary": pdf_summary,
+                        "model_name": selected_model
+                    }),
+                }
+                
+                def generate_chain() -> None:
+                    try:
+                        draft = _pipeline().run_draft_step(
+                            course_id=selected_course_id,
+                            lecture_id=lecture_id,
+                            outline_text=st.session_state.outline,
+                            uploaded_sources_keypoints=sources_data.get("key_ideas", []),
+                            bibliography=st.session_state.get("bibliography", {"core": [], "recent": []}),
+                            model_name=selected_model,
+                            on_token=stream_preview(stream_area)
+                        )
+                    finally:
+                        stream_area.empty()
+                    st.session_state.draft = draft
+                    _finalize_lecture(
+                        selected_course_id,
+                        lecture_id,
+                        draft,
+                        selected_model,
+                        sources_data.get("key_ideas", []),
+                        stream_area
+                    )
                 
-                # Clean up temp file
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
-                    
-            except Exception as e:
-                st.error(f"Ошибка при создании DOCX файла: {str(e)}")
+                if _run_alongside(side_tasks, generate_chain):
+                    st.success(f"Все материалы готовы! Финальная версия: {count_words(st.session_state.final)} слов")
     
-    if "glossary" in st.session_state:
-        with st.expander("Глоссарий"):
-            st.markdown(st.session_state.glossary)
+    # Finalize in one go: revision -> glossary -> Gamma prompt is a chain
+    # (each needs the previous result), the lecture summary is independent,
+    # so its LLM round-trip runs on a worker thread alongside the chain
+    if st.button("Финализировать всё (редактура, глоссарий, резюме, промпт Gamma)"):
+        if "draft" not in st.session_state:
+            st.warning("Сначала сгенерируйте черновик.")
+        else:
+            with st.spinner("Финализация лекции (это может занять время)..."):
+                side_tasks = {
+                    "lecture_summary": ("резюме", generate_lecture_summary, {
+                        "metadata": metadata,
+                        "pdf_summary": sources_data.get("full_summary", ""),
+                        "model_name": selected_model
+                    }),
+                }
+                if _run_alongside(side_tasks, lambda: _finalize_lecture(
+                    selected_course_id,
+                    lecture_id,
+                    st.session_state.draft,
+                    selected_model,
+                    sources_data.get("key_ideas", []),
+                    stream_area
+                )):
+                    st.success("Финальная версия, глоссарий, резюме и промпт для Gamma готовы!")
+    
+    # Display outputs (a fragment: downloads and expanders rerun only this part)
+    _render_outputs(selected_course_id, lecture_id)
     
     # Step 8: Presentation Prompt
     st.header("Шаг 8: Промпт для Gamma")
@@ -733,9 +859,7 @@ def render_lecture_wizard_page():
         else:
             with st.spinner("Генерация промпта..."):
                 try:
-                    sources_data = st.session_state.get("sources_data", {})
-                    
-                    gamma_prompt = pipeline.run_presentation_prompt_step(
+                    gamma_prompt = _pipeline().run_presentation_prompt_step(
                         course_id=selected_course_id,
                         lecture_id=lecture_id,
                         final_lecture_text=st.session_state.final,
@@ -749,24 +873,15 @@ def render_lecture_wizard_page():
     
     if "gamma_prompt" in st.session_state:
         st.subheader("Промпт для Gamma")
-        st.text_area(
-            "Промпт (скопируйте в Gamma)",
-            value=st.session_state.gamma_prompt,
-            height=400
-        )
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("📋 Копировать в буфер обмена"):
-                st.code(st.session_state.gamma_prompt)
-                st.info("Используйте Ctrl+C для копирования из поля выше.")
+        st.caption("Скопируйте промпт в Gamma кнопкой копирования в правом верхнем углу блока.")
+        # st.code has a built-in copy-to-clipboard button, so the prompt is
+        # sent to the browser once instead of again in a separate copy view
+        st.code(st.session_state.gamma_prompt, language="markdown")
         
-        with col2:
-            output_file = config.OUTPUTS_DIR / selected_course_id / f"{lecture_id}_gamma_prompt.md"
-            st.download_button(
-                "💾 Скачать",
-                data=st.session_state.gamma_prompt,
-                file_name=f"{lecture_id}_gamma_prompt.md",
-                mime="text/markdown"
-            )
+        st.download_button(
+            "💾 Скачать",
+            data=_gamma_prompt_bytes(),
+            file_name=f"{lecture_id}_gamma_prompt.md",
+            mime="text/markdown"
+        )
 
@@ -1,48 +1,176 @@
 """
 Text chunking utilities.
 """
+import math
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Sequence
+from src.utils.llm_utils import TOKENS_PER_WORD
+
+try:
+    import tiktoken  # Optional: exact token counts for split_text_by_tokens
+except ImportError:
+    tiktoken = None
+
+# Separators tried in order: paragraphs, lines, sentences, clauses, words
+SEPARATORS = ("\n\n", "\n", ". ", "? ", "! ", "; ", " ")
+
+
+@lru_cache(maxsize=1)
+def _get_encoder():
+    """Load the tiktoken encoder once (building its BPE tables is slow)."""
+    if tiktoken is None:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in text (estimated from the word count without tiktoken).
+    
+    Args:
+        text: Text to measure
+    
+    Returns:
+        Number of tokens
+    """
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return math.ceil(len(text.split()) * TOKENS_PER_WORD)
 
 
 def split_text_into_chunks(
     text: str,
     chunk_size: int = 2500,
     overlap: int = 200,
-    separator: str = "\n\n"
+    separators: Sequence[str] = SEPARATORS
 ) -> list[str]:
     """
     Split text into overlapping chunks.
     
+    Splits recursively: paragraphs first, then lines, sentences and words,
+    falling back to a finer separator only for pieces that still exceed
+    chunk_size, so chunks do not end mid-sentence when avoidable.
+    
     Args:
         text: Text to split
         chunk_size: Target size of each chunk in characters
         overlap: Number of characters to overlap between chunks
-        separator: Separator to prefer when splitting
+        separators: Separators to try, coarsest first
     
     Returns:
         List of text chunks
     """
     if len(text) <= chunk_size:
         return [text]
+    # Hard character cuts ("") only for runs with none of the separators
+    return _split_recursive(text, (*separators, ""), chunk_size, overlap, len)
+
+
+def _split_keeping_separator(text: str, separator: str) -> list[str]:
+    """Split text after each separator, so joining the pieces restores it."""
+    if not separator:
+        return list(text)
+    return re.split(f"(?<={re.escape(separator)})", text)
+
+
+def _merge_pieces(
+    pieces: list[tuple[str, int]],
+    chunk_size: int,
+    overlap: int
+) -> list[str]:
+    """
+    Merge adjacent (piece, size) pairs into chunks of at most chunk_size.
     
+    Trailing pieces of up to overlap in size are carried into the next
+    chunk. Sizes are computed once per piece and summed, so nothing is
+    re-measured while the overlap window slides.
+    """
     chunks = []
-    start = 0
+    window = deque()
+    total = 0
+    
+    for piece, size in pieces:
+        if window and total + size > chunk_size:
+            chunk = "".join(p for p, _ in window).strip()
+            if chunk:
+                chunks.append(chunk)
+            while window and (total > overlap or total + size > chunk_size):
+                total -= window.popleft()[1]
+        window.append((piece, size))
+        total += size
+    
+    chunk = "".join(p for p, _ in window).strip()
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _split_recursive(
+    text: str,
+    separators: Sequence[str],
+    chunk_size: int,
+    overlap: int,
+    size_fn: Callable[[str], int]
+) -> list[str]:
+    """
+    Split on the coarsest separator present, recursing into oversized pieces.
     
-    while start < len(text):
-        end = start + chunk_size
-        
-        if end >= len(text):
-            chunks.append(text[start:])
+    A piece still larger than chunk_size after the last separator is kept
+    whole.
+    """
+    separator = separators[-1]
+    finer = ()
+    for i, candidate in enumerate(separators):
+        if candidate in text:
+            separator = candidate
+            finer = separators[i + 1:]
             break
-        
-        # Try to find a good break point (prefer separator)
-        if separator in text[start:end]:
-            # Find last occurrence of separator before end
-            last_sep = text.rfind(separator, start, end)
-            if last_sep > start:
-                end = last_sep + len(separator)
-        
-        chunks.append(text[start:end].strip())
-        start = end - overlap
     
+    chunks = []
+    fitting = []
+    for piece in _split_keeping_separator(text, separator):
+        size = size_fn(piece)
+        if size <= chunk_size:
+            fitting.append((piece, size))
+            continue
+        if fitting:
+            chunks.extend(_merge_pieces(fitting, chunk_size, overlap))
+            fitting = []
+        if finer:
+            chunks.extend(_split_recursive(piece, finer, chunk_size, overlap, size_fn))
+        elif piece.strip():
+            chunks.append(piece.strip())
+    
+    if fitting:
+        chunks.extend(_merge_pieces(fitting, chunk_size, overlap))
     return chunks
 
+
+def split_text_by_tokens(
+    text: str,
+    max_tokens: int = 1000,
+    overlap_tokens: int = 100,
+    separators: Sequence[str] = SEPARATORS
+) -> list[str]:
+    """
+    Split text into overlapping chunks measured in LLM tokens.
+    
+    Falls back through the separator hierarchy (paragraphs, lines,
+    sentences, words) only for pieces that do not fit, so chunks break on
+    the most natural boundary available.
+    
+    Args:
+        text: Text to split
+        max_tokens: Maximum size of each chunk in tokens
+        overlap_tokens: Number of tokens to overlap between chunks
+        separators: Separators to try, coarsest first
+    
+    Returns:
+        List of text chunks
+    """
+    if count_tokens(text) <= max_tokens:
+        return [text]
+    return _split_recursive(text, separators, max_tokens, overlap_tokens, count_tokens)
@@ -3,9 +3,9 @@ Export utilities for lectures and related content.
 """
 from pathlib import Path
 from typing import Dict, Any
-from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from src.export.docx_exporter import new_document
 
 
 def export_markdown(content: str, file_path: str | Path) -> None:
@@ -18,7 +18,10 @@ def export_markdown(content: str, file_path: str | Path) -> None:
 
 def export_docx(content: str, file_path: str | Path, title: str = "Lecture") -> None:
     """Export content as DOCX file (simple implementation)."""
-    doc = Document()
+    doc = new_document()
+    
+    # Paragraphs use the shared Normal style, so size it once up front
+    doc.styles["Normal"].font.size = Pt(11)
     
     # Add title
     title_para = doc.add_heading(title, level=1)
@@ -39,8 +42,7 @@ def export_docx(content: str, file_path: str | Path, title: str = "Lecture") ->
             doc.add_heading(heading_text, level=min(level, 3))
         else:
             # Regular paragraph
-            p = doc.add_paragraph(para_text)
-            p.style.font.size = Pt(11)
+            doc.add_paragraph(para_text)
     
     path = Path(file_path)
     path.parent.mkdir(parents=True, exist_ok=True)
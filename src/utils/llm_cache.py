@@ -0,0 +1,123 @@
+"""
+Content-addressed on-disk cache for LLM responses.
+"""
+import os
+import threading
+import time
+from hashlib import blake2b
+from typing import Optional
+from src.utils.io_utils import read_text, write_text
+import config
+
+# Responses returned by the simple call_* helpers on failure — never cached
+_ERROR_PREFIXES = ("Grok API error", "DeepSeek API error", "OpenAI API error")
+
+# Cache files not used for this long are deleted by prune_cache() (seconds)
+CACHE_MAX_AGE = 30 * 24 * 3600
+
+# set_cached_response() runs prune_cache() at most this often per process (seconds)
+PRUNE_INTERVAL = 3600
+
+_last_prune = float("-inf")
+_prune_lock = threading.Lock()
+
+
+def llm_cache_key(*parts: str) -> str:
+    """
+    Build a cache key from everything that determines an LLM response.
+    
+    Args:
+        *parts: Model name, system prompt, user prompt, etc.
+    
+    Returns:
+        Hex digest identifying the request
+    """
+    digest = blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")  # Separator so ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+def get_cached_response(namespace: str, key: str) -> Optional[str]:
+    """
+    Get cached LLM response.
+    
+    Args:
+        namespace: Cache subdirectory (e.g. "llm_summaries")
+        key: Key from llm_cache_key()
+    
+    Returns:
+        Cached response text or None
+    """
+    cache_file = config.CACHE_DIR / namespace / f"{key}.txt"
+    try:
+        response = read_text(cache_file)
+    except FileNotFoundError:
+        return None
+    try:
+        # Mark as recently used, so prune_cache() evicts least recently used entries
+        os.utime(cache_file)
+    except OSError:
+        pass
+    return response
+
+
+def set_cached_response(namespace: str, key: str, response: str) -> None:
+    """
+    Store LLM response in cache (empty and error responses are skipped).
+    
+    Args:
+        namespace: Cache subdirectory (e.g. "llm_summaries")
+        key: Key from llm_cache_key()
+        response: Response text
+    """
+    if not response or not response.strip() or response.startswith(_ERROR_PREFIXES):
+        return
+    write_text(config.CACHE_DIR / namespace / f"{key}.txt", response)
+    _maybe_prune()
+
+
+def prune_cache(max_age: float = CACHE_MAX_AGE) -> int:
+    """
+    Delete cache files, in every namespace, not used for max_age seconds.
+    
+    Covers all subdirectories of config.CACHE_DIR (LLM summaries, extracted
+    text, OpenAlex searches); prune_cache(0) empties the cache.
+    
+    Args:
+        max_age: Age in seconds since last write or cache hit
+    
+    Returns:
+        Number of files deleted
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        namespaces = [entry.path for entry in os.scandir(config.CACHE_DIR) if entry.is_dir()]
+    except FileNotFoundError:
+        return 0
+    for namespace_dir in namespaces:
+        with os.scandir(namespace_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime <= cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass  # Deleted concurrently
+    return removed
+
+
+def _maybe_prune() -> None:
+    """Run prune_cache() if PRUNE_INTERVAL has passed (one thread at a time, never blocking)."""
+    global _last_prune
+    if time.monotonic() - _last_prune < PRUNE_INTERVAL:
+        return
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        _last_prune = time.monotonic()
+        prune_cache()
+    finally:
+        _prune_lock.release()
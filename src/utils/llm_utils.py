@@ -3,6 +3,12 @@ LLM utilities for token calculation and text continuation.
 """
 from typing import Optional, Any
 
+# Tokens per word for Russian text (≈1.2) plus a safety margin
+TOKENS_PER_WORD = 1.6
+
+# Characters a complete answer can end with (frozenset: O(1) membership test)
+_PROPER_ENDINGS = frozenset(".!?\"”»…\n")
+
 
 def calculate_max_tokens(target_words: int) -> int:
     """
@@ -16,7 +22,7 @@ def calculate_max_tokens(target_words: int) -> int:
     """
     # Estimate how many tokens are needed for the lecture
     # 1 word ≈ 1.2 tokens (Russian text), use 1.6 for safety margin
-    approx_tokens = int(target_words * 1.6)
+    approx_tokens = int(target_words * TOKENS_PER_WORD)
     # DeepSeek maximum is 8192 — set safe boundary
     return min(approx_tokens, 7800)
 
@@ -44,17 +50,19 @@ def auto_extend_text(
     text = initial_text
     
     # Detect cutoff: ends unexpectedly without punctuation OR ends mid-sentence
-    # Check if text ends with proper punctuation
-    text_stripped = text.strip()
-    if not text_stripped:
+    # Find the last non-whitespace character by scanning back from the end,
+    # instead of stripping a copy of the whole text to read one character
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+    if not end:
         return text
     
     # Check if ends with proper punctuation
-    last_char = text_stripped[-1]
-    proper_endings = [".", "!", "?", "\"", "”", "»", "…", "\n"]
+    last_char = text[end - 1]
     
     # If text doesn't end properly, request continuation
-    if last_char not in proper_endings:
+    if last_char not in _PROPER_ENDINGS:
         # Also check if text seems too short for expected length
         # (rough check: if we're generating a long text but got cut off)
         continuation_messages = [
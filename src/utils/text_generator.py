@@ -1,7 +1,23 @@
 """
 Universal text generator that routes to appropriate LLM based on model name.
 """
-from typing import Optional
+from functools import lru_cache
+from importlib import import_module
+from typing import Callable, Optional
+
+# Provider -> (client module, simple call function); imported on first use only
+_PROVIDER_CALLERS = {
+    "grok": ("src.llm.grok_client", "call_grok"),
+    "deepseek": ("src.llm.deepseek_client", "call_deepseek"),
+    "openai": ("src.llm.openai_client", "call_openai"),
+}
+
+
+@lru_cache(maxsize=None)
+def _get_caller(provider: str) -> Callable[..., str]:
+    """Import a provider's call function once (clients stay lazy until needed)."""
+    module_name, func_name = _PROVIDER_CALLERS[provider]
+    return getattr(import_module(module_name), func_name)
 
 
 def generate_text(prompt: str, model_name: Optional[str] = None, max_tokens: Optional[int] = None) -> str:
@@ -23,16 +39,12 @@ def generate_text(prompt: str, model_name: Optional[str] = None, max_tokens: Opt
         model_name = "deepseek-chat"
     
     if model_name.startswith("grok"):
-        from src.llm.grok_client import call_grok
         # Use provided max_tokens or default
         if max_tokens is None:
             max_tokens = 4096
-        return call_grok(prompt, model=model_name, max_tokens=max_tokens)
+        return _get_caller("grok")(prompt, model=model_name, max_tokens=max_tokens)
     elif model_name.startswith("deepseek"):
-        from src.llm.deepseek_client import call_deepseek
-        return call_deepseek(prompt, model=model_name)
+        return _get_caller("deepseek")(prompt, model=model_name)
     else:
         # OpenAI or other
-        from src.llm.openai_client import call_openai
-        return call_openai(prompt, model=model_name)
-
+        return _get_caller("openai")(prompt, model=model_name)
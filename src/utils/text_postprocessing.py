@@ -2,45 +2,51 @@
 Text post-processing utilities.
 """
 import re
+from typing import List
+
+# Re-exported for existing imports; the single definition lives in llm_utils
+from src.utils.llm_utils import calculate_max_tokens
+
+# Separators for list inputs: "a, b; c" -> ["a", "b", "c"]
+_LIST_SEPARATOR = re.compile(r"\s*[;,]\s*")
+
+# Whitespace cleanup patterns (compiled once, not on every call)
+_MULTIPLE_SPACES = re.compile(r' +')
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+# Any whitespace except the newline itself at the end of a line (== line.rstrip())
+_TRAILING_WHITESPACE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+# Zero-width characters (U+200B-U+200F, BOM) deleted via str.translate
+_ZERO_WIDTH_TABLE = dict.fromkeys([*range(0x200b, 0x2010), 0xfeff])
 
 
 def clean_whitespace(text: str) -> str:
     """Clean excessive whitespace while preserving structure."""
     # Replace multiple spaces with single space
-    text = re.sub(r' +', ' ', text)
+    text = _MULTIPLE_SPACES.sub(' ', text)
     # Replace multiple newlines (more than 2) with double newline
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    # Remove trailing whitespace from lines
-    lines = [line.rstrip() for line in text.split('\n')]
-    return '\n'.join(lines)
+    text = _EXCESS_NEWLINES.sub('\n\n', text)
+    # Remove trailing whitespace from lines in place (no split/join copy)
+    return _TRAILING_WHITESPACE.sub('', text)
 
 
 def normalize_text(text: str) -> str:
     """Normalize text for processing."""
     text = clean_whitespace(text)
     # Remove zero-width characters
-    text = re.sub(r'[\u200b-\u200f\ufeff]', '', text)
+    text = text.translate(_ZERO_WIDTH_TABLE)
     return text.strip()
 
 
-def count_words(text: str) -> int:
-    """Count words in text."""
-    return len(text.split())
-
-
-def calculate_max_tokens(target_words: int) -> int:
+def split_comma_list(text: str) -> List[str]:
     """
-    Calculate max_tokens dynamically based on target word count.
-    
-    Args:
-        target_words: Target word count
+    Split comma- or semicolon-separated input (keywords, authors) into stripped, non-empty items.
     
-    Returns:
-        Calculated max_tokens (capped at 7800)
+    One precompiled split consumes the separators together with the
+    surrounding whitespace, so no per-item strip pass is needed.
     """
-    # Estimate how many tokens are needed for the lecture
-    # 1 word ≈ 1.2 tokens (Russian text), use 1.6 for safety margin
-    approx_tokens = int(target_words * 1.6)
-    # DeepSeek maximum is 8192 — set safe boundary
-    return min(approx_tokens, 7800)
+    return [item for item in _LIST_SEPARATOR.split(text.strip()) if item]
+
 
+def count_words(text: str) -> int:
+    """Count words in text."""
+    return len(text.split())